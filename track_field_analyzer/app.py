@@ -7,29 +7,49 @@ Design inspired by Ochy app - clean, actionable, trustworthy.
 
 from __future__ import annotations
 import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from itertools import islice
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+import cv2
 import numpy as np
-import pandas as pd
 import streamlit as st
 
 from src.io.video import (
-    load_video_from_uploaded_file,
+    load_video_source,
     get_video_properties,
     sample_frames,
+    prefetch,
+    encode_frame_jpeg,
+    decode_frame_jpeg,
     cleanup_temp_file,
 )
-from src.pose.mediapipe_pose import PoseEstimator
+from src.pose.mediapipe_pose import PoseEstimator, estimate_poses_parallel
+from src.analysis.angles import count_visible_joints, landmarks_to_array_batch
 from src.analysis.metrics import (
-    compute_frame_metrics,
+    compute_frame_metrics_batch,
     aggregate_metrics,
     load_target_ranges,
     FrameMetrics,
 )
-from src.analysis.phases import SprintPhase, get_phase_description
+from src.analysis.phases import PHASE_INDEX, SprintPhase, get_phase_description
+from src.analysis.scoring import TRUNK_NOTES, calculate_form_scores_batch, rate_form_scores
 from src.viz.overlay import annotate_frame
 
+# Frames are already processed in parallel (see POSE_WORKERS), so
+# op-level thread pools underneath only oversubscribe the cores. The
+# variables reach libraries loaded from here on, e.g. MediaPipe, which
+# is imported lazily; explicit values in the environment win.
+for _var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+cv2.setNumThreads(1)
+
 # =============================================================================
 # PAGE CONFIG
 # =============================================================================
@@ -43,238 +63,19 @@ st.set_page_config(
 # =============================================================================
 # CUSTOM CSS - Premium Sports Dashboard Theme
 # =============================================================================
-st.markdown("""
-<style>
-/* =========================== */
-/* PREMIUM SPORTS THEME        */
-/* =========================== */
-
-/* Hide default elements */
-#MainMenu, footer, .stDeployButton {display: none;}
-
-/* Typography */
-h1, h2, h3 {font-weight: 600 !important;}
-
-/* Hero Score Card */
-.hero-score {
-    background: linear-gradient(135deg, #1a1a2e 0%, #0d0d1a 100%);
-    border: 2px solid #00d4ff;
-    border-radius: 20px;
-    padding: 2rem;
-    text-align: center;
-    box-shadow: 0 0 30px rgba(0, 212, 255, 0.15);
-}
-
-.hero-score-value {
-    font-size: 4rem;
-    font-weight: 800;
-    background: linear-gradient(90deg, #00d4ff, #22c55e);
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    line-height: 1;
-}
-
-.hero-score-label {
-    color: #a0a0a0;
-    font-size: 0.9rem;
-    text-transform: uppercase;
-    letter-spacing: 2px;
-    margin-bottom: 0.5rem;
-}
-
-.hero-summary {
-    color: #e8e8e8;
-    font-size: 1rem;
-    margin-top: 1rem;
-    line-height: 1.5;
-}
-
-/* Metric Cards */
-.metric-card {
-    background: linear-gradient(135deg, #12121f 0%, #1a1a2e 100%);
-    border: 1px solid rgba(255,255,255,0.1);
-    border-radius: 16px;
-    padding: 1.25rem;
-    margin-bottom: 1rem;
-    box-shadow: 0 4px 20px rgba(0,0,0,0.3);
-}
-
-.metric-label {
-    color: #a0a0a0;
-    font-size: 0.75rem;
-    text-transform: uppercase;
-    letter-spacing: 1px;
-    margin-bottom: 0.25rem;
-}
-
-.metric-value {
-    font-size: 2rem;
-    font-weight: 700;
-    color: #e8e8e8;
-    margin-right: 0.5rem;
-}
-
-.metric-unit {
-    color: #a0a0a0;
-    font-size: 1rem;
-}
-
-/* Status Badges */
-.badge {
-    display: inline-block;
-    padding: 0.25rem 0.75rem;
-    border-radius: 20px;
-    font-size: 0.7rem;
-    font-weight: 600;
-    text-transform: uppercase;
-    letter-spacing: 0.5px;
-}
-
-.badge-good {
-    background: rgba(34, 197, 94, 0.2);
-    color: #22c55e;
-    border: 1px solid rgba(34, 197, 94, 0.4);
-}
-
-.badge-okay {
-    background: rgba(245, 158, 11, 0.2);
-    color: #f59e0b;
-    border: 1px solid rgba(245, 158, 11, 0.4);
-}
-
-.badge-poor {
-    background: rgba(239, 68, 68, 0.2);
-    color: #ef4444;
-    border: 1px solid rgba(239, 68, 68, 0.4);
-}
-
-/* Context Bar (target range) */
-.context-bar {
-    height: 8px;
-    background: linear-gradient(90deg, 
-        #ef4444 0%, 
-        #f59e0b 20%, 
-        #22c55e 40%, 
-        #22c55e 60%, 
-        #f59e0b 80%, 
-        #ef4444 100%);
-    border-radius: 4px;
-    margin: 0.75rem 0;
-    position: relative;
-}
-
-.context-marker {
-    position: absolute;
-    width: 4px;
-    height: 16px;
-    background: #fff;
-    border-radius: 2px;
-    top: -4px;
-    transform: translateX(-50%);
-    box-shadow: 0 0 10px rgba(255,255,255,0.5);
-}
-
-/* Coaching Cue */
-.coaching-cue {
-    color: #a0a0a0;
-    font-size: 0.85rem;
-    line-height: 1.4;
-    margin-top: 0.5rem;
-    padding-left: 0.5rem;
-    border-left: 2px solid #00d4ff;
-}
+THEME_CSS_PATH = Path(__file__).parent / "static" / "theme.css"
 
-/* Focus Area Cards */
-.focus-card {
-    background: linear-gradient(135deg, #12121f 0%, #1a1a2e 100%);
-    border: 1px solid rgba(255,255,255,0.1);
-    border-radius: 16px;
-    padding: 1.25rem;
-    height: 100%;
-    box-shadow: 0 4px 20px rgba(0,0,0,0.3);
-}
 
-.focus-icon {
-    font-size: 2rem;
-    margin-bottom: 0.5rem;
-}
+@st.cache_resource
+def load_theme_css() -> str:
+    """Read the theme stylesheet once per process."""
+    return f"<style>\n{THEME_CSS_PATH.read_text(encoding='utf-8')}</style>"
 
-.focus-title {
-    color: #e8e8e8;
-    font-size: 1rem;
-    font-weight: 600;
-    margin-bottom: 0.25rem;
-}
 
-.focus-value {
-    font-size: 1.5rem;
-    font-weight: 700;
-    margin-bottom: 0.5rem;
-}
-
-.focus-cue {
-    color: #a0a0a0;
-    font-size: 0.85rem;
-    line-height: 1.4;
-}
-
-/* Phase Badge */
-.phase-badge {
-    display: inline-block;
-    padding: 0.5rem 1rem;
-    border-radius: 25px;
-    font-size: 0.9rem;
-    font-weight: 600;
-}
-
-/* Video Container */
-.video-container {
-    background: #0a0a14;
-    border-radius: 12px;
-    overflow: hidden;
-    border: 1px solid rgba(255,255,255,0.1);
-}
-
-/* Info Box */
-.info-box {
-    background: rgba(0, 212, 255, 0.1);
-    border: 1px solid rgba(0, 212, 255, 0.3);
-    border-radius: 12px;
-    padding: 1rem;
-    color: #e8e8e8;
-}
-
-.warning-box {
-    background: rgba(245, 158, 11, 0.1);
-    border: 1px solid rgba(245, 158, 11, 0.3);
-    border-radius: 12px;
-    padding: 1rem;
-    color: #e8e8e8;
-}
-
-/* Sidebar styling */
-.sidebar-header {
-    color: #00d4ff;
-    font-size: 0.8rem;
-    text-transform: uppercase;
-    letter-spacing: 1px;
-    margin-bottom: 0.5rem;
-    margin-top: 1rem;
-}
-
-/* Empty state */
-.empty-state {
-    text-align: center;
-    padding: 3rem;
-    color: #a0a0a0;
-}
-
-.empty-state h3 {
-    color: #e8e8e8;
-    margin-bottom: 1rem;
-}
-</style>
-""", unsafe_allow_html=True)
+def inject_css():
+    # Streamlit drops elements not re-emitted on a rerun, so the style
+    # tag is sent every run; only the file read is cached.
+    st.markdown(load_theme_css(), unsafe_allow_html=True)
 
 
 # =============================================================================
@@ -282,12 +83,20 @@ h1, h2, h3 {font-weight: 600 !important;}
 # =============================================================================
 def init_session_state():
     defaults = {
-        "processed_frames": [],
+        "encoded_frames": [],
+        "frame_overlays": [],
         "frame_metrics": [],
+        "frame_indices": None,
         "current_frame_idx": 0,
         "processing_complete": False,
         "aggregated_metrics": None,
+        "aggregated_version": 0,
+        "metrics_version": 0,
+        "scores_cache": {},
+        "angles_soa": None,
+        "soa_version": -1,
         "video_properties": None,
+        "display_frames": {},
         # User profile
         "user_event": "100m",
         "user_level": "Intermediate",
@@ -302,9 +111,16 @@ def init_session_state():
 # =============================================================================
 def get_rating(value: float, optimal: float, good_range: float = 10, okay_range: float = 20) -> tuple[str, str]:
     """Get rating based on distance from optimal."""
-    if value is None or pd.isna(value):
+    if value is None or math.isnan(value):
         return "poor", "—"
     
+    # Quantize so nearby values share a cache entry. np.round rather than
+    # round(), which differs on some x.x5 values, so rate_array agrees
+    return _rating_cached(float(np.round(float(value), 1)), optimal, good_range, okay_range)
+
+
+@lru_cache(maxsize=512)
+def _rating_cached(value: float, optimal: float, good_range: float, okay_range: float) -> tuple[str, str]:
     diff = abs(value - optimal)
     if diff <= good_range:
         return "good", "✓ Good"
@@ -314,90 +130,216 @@ def get_rating(value: float, optimal: float, good_range: float = 10, okay_range:
         return "poor", "✗ Needs Work"
 
 
-def calculate_form_score(metrics: FrameMetrics | None) -> tuple[float, str, str]:
-    """Calculate overall form score (0-10)."""
-    if metrics is None:
-        return 0, "poor", "No pose detected"
+_RATINGS = np.array(["good", "okay", "poor"])
+_BADGE_TEXT = {"good": "✓ Good", "okay": "⚠ Okay", "poor": "✗ Needs Work"}
+
+
+def rate_array(values: np.ndarray, optimal: float, good_range: float = 10, okay_range: float = 20) -> np.ndarray:
+    """Vectorized get_rating: rating string per value, "poor" where NaN."""
+    # Round in float64 like get_rating; float32 rounding moves x.x5 values
+    # across band edges
+    diff = np.abs(np.round(np.asarray(values, dtype=np.float64), 1) - optimal)
+    return _RATINGS[np.digitize(diff, [good_range, okay_range], right=True)]
+
+
+# Angle columns kept in the per-session struct-of-arrays table
+_SOA_ANGLES = (
+    "trunk_lean", "left_knee", "right_knee",
+    "left_hip", "right_hip", "left_elbow", "right_elbow",
+)
+
+# Detailed metric card targets: column -> (optimal, target_min, target_max)
+_CARD_TARGETS = {
+    "trunk_lean_abs": (40, 30, 55),
+    "left_knee": (110, 90, 140),
+    "right_knee": (110, 90, 140),
+    "left_hip": (160, 140, 180),
+    "right_hip": (160, 140, 180),
+    "left_elbow": (90, 80, 100),
+}
+
+# Detailed metric cards, first three in the left column:
+# (column, label, icon, coaching cue; None = phase-specific trunk cue)
+_METRIC_CARDS = (
+    ("trunk_lean_abs", "Trunk Lean", "🔄", None),
+    ("left_knee", "Left Knee", "🦵", "Knee flexion for power output"),
+    ("left_hip", "Left Hip", "🏃", "Hip extension for stride length"),
+    ("left_elbow", "Left Elbow", "💪", "Keep elbows at ~90° for efficient arm drive"),
+    ("right_knee", "Right Knee", "🦵", "Match left knee drive for symmetry"),
+    ("right_hip", "Right Hip", "🏃", "Full hip extension on each stride"),
+)
+
+
+def build_angles_soa(metrics_list: list[FrameMetrics]) -> dict[str, np.ndarray]:
+    """Convert per-frame angle dicts into one float32 column per angle.
     
-    score = 5.0  # Base
-    notes = []
-    
-    angles = metrics.angles
-    trunk = abs(angles.get("trunk_lean", 0) or 0)
-    
-    # Phase-appropriate scoring
-    if metrics.phase == SprintPhase.SET:
-        if 40 <= trunk <= 55:
-            score += 2
-            notes.append("good forward lean")
-        elif 30 <= trunk <= 60:
-            score += 1
-    elif metrics.phase == SprintPhase.DRIVE:
-        if 30 <= trunk <= 50:
-            score += 2.5
-            notes.append("strong drive angle")
-        elif 20 <= trunk <= 55:
-            score += 1.5
-    elif metrics.phase == SprintPhase.ACCELERATION:
-        if 15 <= trunk <= 35:
-            score += 2
-        elif 10 <= trunk <= 40:
-            score += 1
-    elif metrics.phase == SprintPhase.MAX_VELOCITY:
-        if trunk <= 15:
-            score += 2.5
-            notes.append("good upright posture")
-        elif trunk <= 25:
-            score += 1.5
-    
-    # Knee drive bonus
-    left_knee = angles.get("left_knee")
-    right_knee = angles.get("right_knee")
-    if left_knee and right_knee:
-        front_knee = min(left_knee, right_knee)
-        if 90 <= front_knee <= 120:
-            score += 1
-    
-    # Unknown phase penalty
-    if metrics.phase == SprintPhase.UNKNOWN:
-        score -= 1
-    
-    score = max(0, min(10, score))
-    
-    if score >= 7:
-        rating = "good"
-    elif score >= 5:
-        rating = "okay"
+    Missing angles become NaN. The "phase" column holds PHASE_INDEX codes,
+    and "front_knee" is the more flexed knee (NaN only if both are missing).
+    "trunk_rating" and "knee_rating" hold the focus card rating per frame.
+    "trunk_lean_abs" is the lean magnitude, which is what the cards display.
+    "<column>_card_rating" holds the detailed metric card rating per frame.
+    "frame_index" holds the video frame numbers, in ascending order.
+    """
+    soa = {
+        key: np.array([m.angles.get(key, np.nan) for m in metrics_list], dtype=np.float32)
+        for key in _SOA_ANGLES
+    }
+    soa["trunk_lean_abs"] = np.abs(soa["trunk_lean"])
+    soa["front_knee"] = np.fmin(soa["left_knee"], soa["right_knee"])
+    soa["trunk_rating"] = rate_array(soa["trunk_lean_abs"], 40, 10, 20)
+    soa["knee_rating"] = rate_array(soa["front_knee"], 110, 15, 25)
+    for key, (optimal, target_min, target_max) in _CARD_TARGETS.items():
+        span = target_max - target_min
+        soa[f"{key}_card_rating"] = rate_array(soa[key], optimal, span / 3, span / 2)
+    soa["phase"] = np.fromiter(
+        (PHASE_INDEX[m.phase] for m in metrics_list), dtype=np.int8, count=len(metrics_list)
+    )
+    soa["frame_index"] = np.fromiter(
+        (m.frame_index for m in metrics_list), dtype=np.int64, count=len(metrics_list)
+    )
+    return soa
+
+
+def metrics_row_for_frame(soa: dict[str, np.ndarray], pos: int) -> int:
+    """Map the position of a stored frame to its row in the metrics table.
+    
+    Only frames with a usable pose have metrics, so the row is that of the
+    last such frame at or before the one shown, found by binary search
+    over the frame numbers. Without recorded frame numbers the position
+    is clamped to the table instead.
+    """
+    frame_indices = st.session_state.frame_indices
+    if frame_indices is None or pos >= len(frame_indices):
+        return min(pos, len(soa["frame_index"]) - 1)
+    
+    row = np.searchsorted(soa["frame_index"], frame_indices[pos], side="right") - 1
+    return max(int(row), 0)
+
+
+def get_angles_soa(metrics_list: list[FrameMetrics]) -> dict[str, np.ndarray]:
+    """Get the session angle table, rebuilding only when the metrics changed."""
+    if st.session_state.soa_version != st.session_state.metrics_version:
+        st.session_state.angles_soa = build_angles_soa(metrics_list)
+        st.session_state.soa_version = st.session_state.metrics_version
+    return st.session_state.angles_soa
+
+
+def get_form_scores(metrics_list: list[FrameMetrics]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Get batch (scores, inner_hit, ratings), cached per metrics version.
+    
+    Keyed by metrics_version rather than id(metrics_list): a new analysis
+    can reuse the id of a freed list and would then hit stale scores.
+    """
+    key = st.session_state.metrics_version
+    cache = st.session_state.scores_cache
+    if key not in cache:
+        cache.clear()
+        soa = get_angles_soa(metrics_list)
+        scores, inner_hit = calculate_form_scores_batch(
+            soa["trunk_lean"], soa["left_knee"], soa["right_knee"], soa["phase"]
+        )
+        cache[key] = (scores, inner_hit, rate_form_scores(scores))
+    return cache[key]
+
+
+def get_aggregated_metrics(metrics_list: list[FrameMetrics]) -> dict[str, Any]:
+    """Get session aggregates, recomputing only when the metrics changed."""
+    if st.session_state.aggregated_version != st.session_state.metrics_version:
+        st.session_state.aggregated_metrics = aggregate_metrics(metrics_list)
+        st.session_state.aggregated_version = st.session_state.metrics_version
+    
+    aggregated = st.session_state.aggregated_metrics
+    assert aggregated is not None, "aggregate_metrics must run after processing"
+    return aggregated
+
+
+def get_display_frames(idx: int, settings: dict) -> tuple[bytes, bytes]:
+    """Get (full, preview) JPEGs of frame idx with the pose overlay drawn.
+    
+    Frames are stored un-annotated, so only the frame on screen is ever
+    drawn. The DISPLAY_CACHE_SIZE most recently shown results are kept,
+    so stepping back and forth between nearby frames redraws nothing.
+    """
+    conf = settings.get("confidence", 0.5)
+    show_angles = settings.get("show_angles", False)
+    key = (st.session_state.metrics_version, idx, show_angles, conf)
+    
+    cache = st.session_state.display_frames
+    if key in cache:
+        cache[key] = cache.pop(key)  # Mark as most recently used
+        return cache[key]
+    
+    stored = st.session_state.encoded_frames[idx]
+    frame_rgb = decode_frame_jpeg(stored)
+    overlays = st.session_state.frame_overlays
+    overlay = overlays[idx] if idx < len(overlays) else None
+    
+    if overlay is not None:
+        landmarks, metrics = overlay
+        frame_rgb = annotate_frame(
+            frame_rgb, landmarks, metrics.angles, metrics.phase,
+            metrics.frame_index, metrics.timestamp_sec,
+            draw_angles=show_angles,
+            draw_info=True,
+            visibility_threshold=conf,
+            out=frame_rgb,  # Freshly decoded, so drawn on directly
+        )
+        full = encode_frame_jpeg(frame_rgb)
     else:
-        rating = "poor"
+        full = stored
+    
+    images = (full, encode_frame_jpeg(frame_rgb, max_width=PREVIEW_WIDTH))
+    cache[key] = images
+    if len(cache) > DISPLAY_CACHE_SIZE:
+        del cache[next(iter(cache))]
+    return images
+
+
+def calculate_form_score(metrics_list: list[FrameMetrics], idx: int) -> tuple[float, str, str]:
+    """Calculate overall form score (0-10) for one frame."""
+    if not metrics_list:
+        return 0, "poor", "No pose detected"
+    
+    scores, inner_hit, ratings = get_form_scores(metrics_list)
+    score = float(scores[idx])
+    rating = str(ratings[idx])
     
-    summary = ", ".join(notes) if notes else "Keep working on form"
+    note = TRUNK_NOTES[get_angles_soa(metrics_list)["phase"][idx]] if inner_hit[idx] else ""
+    summary = note or "Keep working on form"
     return score, rating, summary
 
 
+_COACHING_CUES = {
+    "trunk_lean": {
+        "low": "Lean more forward from your ankles, not your waist",
+        "high": "You're rising too quickly—stay low longer",
+        "good": "Great forward lean angle!"
+    },
+    "knee_drive": {
+        "low": "Drive your knee higher toward your chest",
+        "high": "Good knee drive, focus on quick ground contact",
+        "good": "Excellent knee drive!"
+    },
+    "arm_action": {
+        "low": "Keep elbows at ~90°, drive arms more aggressively",
+        "high": "Relax your arms slightly, maintain 90° bend",
+        "good": "Good arm mechanics!"
+    }
+}
+
+
 def get_coaching_cue(metric_name: str, value: float, phase: SprintPhase) -> str:
     """Get actionable coaching cue for a metric."""
-    cues = {
-        "trunk_lean": {
-            "low": "Lean more forward from your ankles, not your waist",
-            "high": "You're rising too quickly—stay low longer",
-            "good": "Great forward lean angle!"
-        },
-        "knee_drive": {
-            "low": "Drive your knee higher toward your chest",
-            "high": "Good knee drive, focus on quick ground contact",
-            "good": "Excellent knee drive!"
-        },
-        "arm_action": {
-            "low": "Keep elbows at ~90°, drive arms more aggressively",
-            "high": "Relax your arms slightly, maintain 90° bend",
-            "good": "Good arm mechanics!"
-        }
-    }
-    
-    if value is None or pd.isna(value):
+    if value is None or math.isnan(value):
         return "Unable to measure—check video quality"
     
+    return _coaching_cue_cached(metric_name, round(float(value), 1), phase)
+
+
+@lru_cache(maxsize=512)
+def _coaching_cue_cached(metric_name: str, value: float, phase: SprintPhase) -> str:
+    cues = _COACHING_CUES
+    
     # Determine if value is low, high, or good
     if metric_name == "trunk_lean":
         value = abs(value)
@@ -444,9 +386,24 @@ def render_sidebar() -> dict:
         
         # Model settings
         with st.expander("🔧 Advanced"):
-            model_complexity = st.selectbox("Model Quality", [0, 1, 2], index=1,
-                format_func=lambda x: ["Lite", "Full", "Heavy"][x])
-            confidence = st.slider("Confidence Threshold", 0.3, 0.9, 0.5)
+            model_complexity = st.selectbox("Model Quality", [0, 1, 2], index=0,
+                format_func=lambda x: ["Lite", "Full", "Heavy"][x],
+                help="Lite is the fastest; Heavy is the most precise")
+            confidence = st.slider("Confidence Threshold", 0.3, 0.9, 0.5,
+                help="Minimum landmark visibility for a joint to be measured and drawn")
+            # Detection is the expensive step; a high bar to lock onto the
+            # athlete and a low bar to keep tracking lets MediaPipe skip
+            # re-detection while the pose is followed frame to frame
+            detection_confidence = st.slider("Detection Confidence", 0.3, 0.9, 0.7,
+                help="Minimum score to find the athlete when not already tracking")
+            tracking_confidence = st.slider("Tracking Confidence", 0.1, 0.9, 0.3,
+                help="Minimum score to keep following the athlete between frames; "
+                     "below it the detector runs again")
+            pose_input_size = st.selectbox("Pose Input Size", [256, 360, 480, 720, None], index=2,
+                format_func=lambda x: f"{x}px" if x else "Native",
+                help="Frames are downscaled to this size before pose detection. "
+                     "The landmark model itself runs at 256px; larger sizes help "
+                     "the detector find small or distant athletes")
         
         st.markdown("---")
         
@@ -488,33 +445,56 @@ def render_sidebar() -> dict:
         "video_width": video_width,
         "show_skeleton": show_skeleton,
         "show_angles": show_angles_on_video,
-        "model_complexity": model_complexity if 'model_complexity' in dir() else 1,
-        "confidence": confidence if 'confidence' in dir() else 0.5,
+        "model_complexity": model_complexity,
+        "confidence": confidence,
+        "detection_confidence": detection_confidence,
+        "tracking_confidence": tracking_confidence,
+        "pose_input_size": pose_input_size,
     }
 
 
 # =============================================================================
 # METRIC CARD COMPONENT
 # =============================================================================
-def render_metric_card(label: str, value: float | None, unit: str, 
-                       optimal: float, target_min: float, target_max: float,
-                       coaching_cue: str, icon: str = "📐"):
-    """Render a premium metric card with context bar."""
+def metric_card_html(label: str, value: float | None, unit: str, 
+                     optimal: float, target_min: float, target_max: float,
+                     coaching_cue: str, icon: str = "📐", rating: str | None = None) -> str:
+    """Build a premium metric card with context bar as HTML.
+    
+    Cards are returned rather than rendered so several can share one
+    st.markdown element.
     
-    if value is None or pd.isna(value):
+    value is an angle magnitude (non-negative), e.g. a "*_abs" column.
+    rating, if given, is the precomputed "*_card_rating" for value.
+    """
+    
+    if value is None or math.isnan(value):
         value_display = "—"
         rating, badge_text = "poor", "No Data"
         marker_pos = 50
     else:
-        value_display = f"{abs(value):.0f}"
-        rating, badge_text = get_rating(abs(value), optimal, 
-            good_range=(target_max - target_min) / 3,
-            okay_range=(target_max - target_min) / 2)
+        value_display = f"{value:.0f}"
+        if rating is None:
+            rating, badge_text = get_rating(value, optimal, 
+                good_range=(target_max - target_min) / 3,
+                okay_range=(target_max - target_min) / 2)
+        else:
+            badge_text = _BADGE_TEXT[rating]
         # Calculate marker position (0-100%)
         range_size = target_max - target_min
-        marker_pos = max(0, min(100, ((abs(value) - target_min + range_size * 0.3) / (range_size * 1.6)) * 100))
+        marker_pos = max(0, min(100, ((value - target_min + range_size * 0.3) / (range_size * 1.6)) * 100))
     
-    st.markdown(f"""
+    return _metric_card_html(
+        label, value_display, unit, target_min, target_max,
+        coaching_cue, icon, rating, badge_text, round(marker_pos, 1),
+    )
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _metric_card_html(label: str, value_display: str, unit: str,
+                      target_min: float, target_max: float, coaching_cue: str,
+                      icon: str, rating: str, badge_text: str, marker_pos: float) -> str:
+    return f"""
     <div class="metric-card">
         <div style="display: flex; justify-content: space-between; align-items: flex-start;">
             <div>
@@ -536,25 +516,32 @@ def render_metric_card(label: str, value: float | None, unit: str,
         </div>
         <div class="coaching-cue">{coaching_cue}</div>
     </div>
-    """, unsafe_allow_html=True)
+    """
 
 
 # =============================================================================
 # FOCUS AREA CARD
 # =============================================================================
+_FOCUS_COLORS = {"good": "#22c55e", "okay": "#f59e0b", "poor": "#ef4444"}
+
+
 def render_focus_card(icon: str, title: str, value: str, rating: str, cue: str):
     """Render a focus area card."""
-    colors = {"good": "#22c55e", "okay": "#f59e0b", "poor": "#ef4444"}
-    color = colors.get(rating, "#a0a0a0")
+    color = _FOCUS_COLORS.get(rating, "#a0a0a0")
     
-    st.markdown(f"""
+    st.markdown(_focus_card_html(icon, title, value, color, cue), unsafe_allow_html=True)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _focus_card_html(icon: str, title: str, value: str, color: str, cue: str) -> str:
+    return f"""
     <div class="focus-card">
         <div class="focus-icon">{icon}</div>
         <div class="focus-title">{title}</div>
         <div class="focus-value" style="color: {color};">{value}</div>
         <div class="focus-cue">{cue}</div>
     </div>
-    """, unsafe_allow_html=True)
+    """
 
 
 # =============================================================================
@@ -562,7 +549,12 @@ def render_focus_card(icon: str, title: str, value: str, rating: str, cue: str):
 # =============================================================================
 def render_hero_score(score: float, rating: str, summary: str):
     """Render the hero score card."""
-    st.markdown(f"""
+    st.markdown(_hero_score_html(round(score, 1), rating, summary), unsafe_allow_html=True)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _hero_score_html(score: float, rating: str, summary: str) -> str:
+    return f"""
     <div class="hero-score">
         <div class="hero-score-label">Form Score</div>
         <div class="hero-score-value">{score:.1f}<span style="font-size: 2rem;">/10</span></div>
@@ -571,16 +563,58 @@ def render_hero_score(score: float, rating: str, summary: str):
         </span>
         <div class="hero-summary">{summary.capitalize()}</div>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+
+# =============================================================================
+# FRAME NAVIGATION
+# =============================================================================
+# Widget callbacks run before the script, so updating current_frame_idx
+# here renders the new frame in the same run without st.rerun().
+def step_frame(delta: int, num_frames: int):
+    """Move the current frame by delta, clamped to the valid range."""
+    idx = st.session_state.current_frame_idx + delta
+    st.session_state.current_frame_idx = max(0, min(num_frames - 1, idx))
+
+
+def sync_frame_from_slider(key: str):
+    """Copy a slider's value into current_frame_idx."""
+    st.session_state.current_frame_idx = st.session_state[key]
+
+
+def frame_slider(key: str, num_frames: int):
+    """Render a frame slider that mirrors current_frame_idx."""
+    st.session_state[key] = st.session_state.current_frame_idx
+    st.slider(
+        "Frame", 0, num_frames - 1,
+        key=key,
+        label_visibility="collapsed",
+        on_change=sync_frame_from_slider, args=(key,),
+    )
 
 
 # =============================================================================
 # MAIN ANALYSIS VIEW
 # =============================================================================
+_PHASE_COLORS = {
+    SprintPhase.SET: "#ef4444",
+    SprintPhase.DRIVE: "#f59e0b",
+    SprintPhase.ACCELERATION: "#eab308",
+    SprintPhase.MAX_VELOCITY: "#22c55e",
+    SprintPhase.UNKNOWN: "#a0a0a0",
+}
+
+
+@st.fragment
 def render_analysis_view(settings: dict):
-    """Render the main analysis dashboard."""
+    """Render the main analysis dashboard.
     
-    frames = st.session_state.processed_frames
+    Runs as a fragment so frame navigation reruns only the dashboard,
+    not the CSS, sidebar and page chrome. All tabs live inside it
+    because they share the current frame index.
+    """
+    
+    frames = st.session_state.encoded_frames
     metrics_list = st.session_state.frame_metrics
     
     if not frames or not metrics_list:
@@ -588,12 +622,14 @@ def render_analysis_view(settings: dict):
         return
     
     # Get current frame data
-    idx = min(st.session_state.current_frame_idx, len(metrics_list) - 1)
+    soa = get_angles_soa(metrics_list)
+    idx = metrics_row_for_frame(soa, st.session_state.current_frame_idx)
     current_metrics = metrics_list[idx]
-    aggregated = st.session_state.aggregated_metrics or aggregate_metrics(metrics_list)
+    aggregated = get_aggregated_metrics(metrics_list)
     
     # Calculate scores
-    score, rating, summary = calculate_form_score(current_metrics)
+    score, rating, summary = calculate_form_score(metrics_list, idx)
+    frame_jpeg, preview_jpeg = get_display_frames(st.session_state.current_frame_idx, settings)
     
     # ===== TABS =====
     tab_overview, tab_video, tab_metrics, tab_info = st.tabs([
@@ -616,27 +652,26 @@ def render_analysis_view(settings: dict):
             focus_cols = st.columns(3)
             
             # Focus 1: Trunk Lean
-            trunk = current_metrics.angles.get("trunk_lean")
-            trunk_rating, _ = get_rating(abs(trunk) if trunk else 0, 40, 10, 20)
+            trunk = soa["trunk_lean_abs"][idx]
+            trunk_rating = soa["trunk_rating"][idx]
             with focus_cols[0]:
                 render_focus_card(
                     "🏃", "Trunk Lean",
-                    f"{abs(trunk):.0f}°" if trunk and not pd.isna(trunk) else "—",
+                    f"{trunk:.0f}°" if not math.isnan(trunk) else "—",
                     trunk_rating,
                     get_coaching_cue("trunk_lean", trunk, current_metrics.phase)
                 )
             
             # Focus 2: Knee Drive
-            left_knee = current_metrics.angles.get("left_knee")
-            right_knee = current_metrics.angles.get("right_knee")
-            front_knee = min(left_knee or 180, right_knee or 180) if (left_knee or right_knee) else None
-            knee_rating, _ = get_rating(front_knee, 110, 15, 25) if front_knee else ("poor", "—")
+            front_knee = soa["front_knee"][idx]
+            knee_visible = not math.isnan(front_knee)
+            knee_rating = soa["knee_rating"][idx]
             with focus_cols[1]:
                 render_focus_card(
                     "🦵", "Knee Drive",
-                    f"{front_knee:.0f}°" if front_knee and not pd.isna(front_knee) else "—",
+                    f"{front_knee:.0f}°" if knee_visible else "—",
                     knee_rating,
-                    "Drive knee high for power" if front_knee and front_knee < 100 else "Good knee lift!"
+                    "Drive knee high for power" if knee_visible and front_knee < 100 else "Good knee lift!"
                 )
             
             # Focus 3: Phase
@@ -653,50 +688,32 @@ def render_analysis_view(settings: dict):
         with col_right:
             # Compact video preview
             st.markdown("### 🎬 Preview")
-            current_frame = frames[st.session_state.current_frame_idx]
-            st.image(current_frame, use_container_width=True)
+            st.image(preview_jpeg, use_container_width=True,
+                     output_format="JPEG")
             
             # Frame slider
-            new_idx = st.slider(
-                "Frame", 0, len(frames) - 1, 
-                st.session_state.current_frame_idx,
-                label_visibility="collapsed"
-            )
-            if new_idx != st.session_state.current_frame_idx:
-                st.session_state.current_frame_idx = new_idx
-                st.rerun()
+            frame_slider("preview_slider", len(frames))
     
     # ===== VIDEO TAB =====
     with tab_video:
         # Navigation
         nav_cols = st.columns([1, 6, 1])
         with nav_cols[0]:
-            if st.button("◀ Prev", use_container_width=True):
-                if st.session_state.current_frame_idx > 0:
-                    st.session_state.current_frame_idx -= 1
-                    st.rerun()
+            st.button("◀ Prev", use_container_width=True,
+                      on_click=step_frame, args=(-1, len(frames)))
         with nav_cols[1]:
-            frame_idx = st.slider(
-                "Frame", 0, len(frames) - 1,
-                st.session_state.current_frame_idx,
-                label_visibility="collapsed",
-                key="video_slider"
-            )
-            if frame_idx != st.session_state.current_frame_idx:
-                st.session_state.current_frame_idx = frame_idx
-                st.rerun()
+            frame_slider("video_slider", len(frames))
         with nav_cols[2]:
-            if st.button("Next ▶", use_container_width=True):
-                if st.session_state.current_frame_idx < len(frames) - 1:
-                    st.session_state.current_frame_idx += 1
-                    st.rerun()
+            st.button("Next ▶", use_container_width=True,
+                      on_click=step_frame, args=(1, len(frames)))
         
         # Video display
         video_col_ratio = settings["video_width"] / 100
         vid_col, info_col = st.columns([video_col_ratio * 2, (1 - video_col_ratio) * 2])
         
         with vid_col:
-            st.image(frames[st.session_state.current_frame_idx], use_container_width=True)
+            st.image(frame_jpeg, use_container_width=True,
+                     output_format="JPEG")
             st.markdown(f"""
             <div style="text-align: center; color: #a0a0a0; font-size: 0.85rem;">
                 Frame {current_metrics.frame_index} | {current_metrics.timestamp_sec:.2f}s | 
@@ -707,16 +724,10 @@ def render_analysis_view(settings: dict):
         with info_col:
             # Phase badge
             phase = current_metrics.phase
-            phase_colors = {
-                SprintPhase.SET: "#ef4444",
-                SprintPhase.DRIVE: "#f59e0b", 
-                SprintPhase.ACCELERATION: "#eab308",
-                SprintPhase.MAX_VELOCITY: "#22c55e",
-                SprintPhase.UNKNOWN: "#a0a0a0",
-            }
+            phase_color = _PHASE_COLORS[phase]
             st.markdown(f"""
-            <div class="phase-badge" style="background: {phase_colors[phase]}20; 
-                 border: 2px solid {phase_colors[phase]}; color: {phase_colors[phase]};">
+            <div class="phase-badge" style="background: {phase_color}20; 
+                 border: 2px solid {phase_color}; color: {phase_color};">
                 {phase.display_name}
             </div>
             """, unsafe_allow_html=True)
@@ -725,64 +736,32 @@ def render_analysis_view(settings: dict):
             
             # Quick metrics
             st.markdown("**Quick Stats**")
-            angles = current_metrics.angles
-            for name, key in [("Trunk Lean", "trunk_lean"), ("Left Knee", "left_knee"), 
+            for name, key in [("Trunk Lean", "trunk_lean_abs"), ("Left Knee", "left_knee"), 
                               ("Right Knee", "right_knee")]:
-                val = angles.get(key)
-                if val and not pd.isna(val):
-                    st.markdown(f"- {name}: **{abs(val):.0f}°**")
+                val = soa[key][idx]
+                if not math.isnan(val):
+                    st.markdown(f"- {name}: **{val:.0f}°**")
     
     # ===== METRICS TAB =====
     with tab_metrics:
         st.markdown("### 📐 Detailed Metrics")
         
-        col1, col2 = st.columns(2)
-        
-        angles = current_metrics.angles
+        # One markdown element per column rather than per card: every
+        # element is a separate update sent to the browser on each rerun
+        column_html = ([], [])
+        for i, (key, label, icon, cue) in enumerate(_METRIC_CARDS):
+            optimal, target_min, target_max = _CARD_TARGETS[key]
+            value = soa[key][idx]
+            column_html[i // 3].append(metric_card_html(
+                label, value, "°",
+                optimal=optimal, target_min=target_min, target_max=target_max,
+                coaching_cue=cue or get_coaching_cue("trunk_lean", value, current_metrics.phase),
+                icon=icon,
+                rating=soa[f"{key}_card_rating"][idx],
+            ))
         
-        with col1:
-            render_metric_card(
-                "Trunk Lean", angles.get("trunk_lean"), "°",
-                optimal=40, target_min=30, target_max=55,
-                coaching_cue=get_coaching_cue("trunk_lean", angles.get("trunk_lean"), current_metrics.phase),
-                icon="🔄"
-            )
-            
-            render_metric_card(
-                "Left Knee", angles.get("left_knee"), "°",
-                optimal=110, target_min=90, target_max=140,
-                coaching_cue="Knee flexion for power output",
-                icon="🦵"
-            )
-            
-            render_metric_card(
-                "Left Hip", angles.get("left_hip"), "°",
-                optimal=160, target_min=140, target_max=180,
-                coaching_cue="Hip extension for stride length",
-                icon="🏃"
-            )
-        
-        with col2:
-            render_metric_card(
-                "Left Elbow", angles.get("left_elbow"), "°",
-                optimal=90, target_min=80, target_max=100,
-                coaching_cue="Keep elbows at ~90° for efficient arm drive",
-                icon="💪"
-            )
-            
-            render_metric_card(
-                "Right Knee", angles.get("right_knee"), "°",
-                optimal=110, target_min=90, target_max=140,
-                coaching_cue="Match left knee drive for symmetry",
-                icon="🦵"
-            )
-            
-            render_metric_card(
-                "Right Hip", angles.get("right_hip"), "°",
-                optimal=160, target_min=140, target_max=180,
-                coaching_cue="Full hip extension on each stride",
-                icon="🏃"
-            )
+        for col, cards in zip(st.columns(2), column_html):
+            col.markdown("\n".join(cards), unsafe_allow_html=True)
         
         # Averages section
         with st.expander("📊 Session Averages"):
@@ -894,6 +873,82 @@ def render_upload_view(settings: dict):
 # =============================================================================
 # VIDEO PROCESSING
 # =============================================================================
+# Parallel pose inference: one estimator per worker thread, fed in
+# windows of POSE_WINDOW_PER_WORKER frames each to bound memory. Only
+# static-mode (independent frame) inference is spread over workers; a
+# tracking estimator has to see every sampled frame of the clip in order.
+# Threads rather than processes: MediaPipe releases the GIL while
+# inferring, and worker processes would each load their own model and
+# re-decode up to a keyframe at every shard boundary.
+POSE_WORKERS = min(4, os.cpu_count() or 1)
+POSE_WINDOW_PER_WORKER = 8
+
+# JPEG encoding of each window is spread over the cores left after the
+# pose workers; cv2.imencode releases the GIL
+ENCODE_WORKERS = max(1, min(4, (os.cpu_count() or 1) - POSE_WORKERS))
+
+# POSE_DELEGATE=gpu runs pose inference on MediaPipe's GPU delegate on
+# hosts that have one; the default CPU path needs no graphics stack
+POSE_USE_GPU = os.environ.get("POSE_DELEGATE", "cpu").lower() == "gpu"
+
+# Width of the downscaled frames shown in the overview preview
+PREVIEW_WIDTH = 480
+
+# Annotated (full, preview) JPEG pairs kept per session, each under 0.5 MB
+DISPLAY_CACHE_SIZE = 8
+
+# st.image decodes, resizes and re-encodes any image wider than its max
+# content width (1460px) on every render, so full frames are stored at
+# most this wide and then served as-is
+FRAME_MAX_WIDTH = 1460
+
+# Poses with fewer visible body joints than this cannot yield any joint
+# angle (three points each), so they are treated as no detection
+MIN_VISIBLE_JOINTS = 3
+
+# Each widget update is a websocket round-trip; the progress bar only
+# moves on whole-percent changes and the status line at most this often
+STATUS_INTERVAL_SEC = 0.25
+
+
+# Sampled frames further apart than this are too far apart for MediaPipe
+# to track the pose between them, so each one is detected independently
+TRACKING_MAX_GAP_SEC = 0.1
+
+
+# Only the most recent settings' pool is kept; each estimator holds a
+# full MediaPipe graph and every slider position would otherwise add one
+@st.cache_resource(show_spinner=False, max_entries=POSE_WORKERS)
+def get_pose_estimator(
+    model_complexity: int,
+    detection_confidence: float,
+    tracking_confidence: float,
+    worker: int = 0,
+    input_size: int | None = 480,
+    static_image_mode: bool = False,
+) -> PoseEstimator:
+    """Create the pose model once per settings combination and reuse it.
+    
+    Tracking mode suits closely spaced samples of one video; static mode
+    detects every frame from scratch. Each worker index gets its own
+    instance.
+    """
+    return PoseEstimator(
+        static_image_mode=static_image_mode,
+        model_complexity=model_complexity,
+        min_detection_confidence=detection_confidence,
+        min_tracking_confidence=tracking_confidence,
+        max_input_size=input_size,
+        use_gpu=POSE_USE_GPU,
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_pose_lock() -> threading.Lock:
+    """Lock serializing access to the shared pose models across sessions."""
+    return threading.Lock()
+
+
 def process_video(uploaded_file, settings: dict):
     """Process uploaded video."""
     
@@ -902,56 +957,145 @@ def process_video(uploaded_file, settings: dict):
     
     try:
         status.text("Loading video...")
-        video_path = load_video_from_uploaded_file(uploaded_file)
-        props = get_video_properties(video_path)
-        st.session_state.video_properties = props
-        
-        target_config = load_target_ranges()
-        frames = []
-        metrics_list = []
-        
-        total = min(props["frame_count"] // settings["sample_rate"], settings["max_frames"])
-        
-        with PoseEstimator(
-            static_image_mode=False,
-            model_complexity=settings.get("model_complexity", 1),
-            min_detection_confidence=settings.get("confidence", 0.5),
-            min_tracking_confidence=settings.get("confidence", 0.5),
-        ) as estimator:
+        _rating_cached.cache_clear()
+        _coaching_cue_cached.cache_clear()
+        video_source = load_video_source(uploaded_file)
+        try:
+            props = get_video_properties(video_source)
+            st.session_state.video_properties = props
+            
+            # Cached by file mtime, so an edited config applies to the next run
+            target_config = load_target_ranges()
+            # At most 100 sampled frames, each kept as one JPEG: a few MB in
+            # total, and any frame can be shown without seeking in a video.
+            # A preallocated (N, H, W, 3) array would hold the same frames raw,
+            # about 20x the memory, and st.image would re-encode on every view.
+            frames = []
+            frame_indices = []
+            overlays = []
+            metrics_list = []
+            
+            total = min(props["frame_count"] // settings["sample_rate"], settings["max_frames"])
+            fps = props["fps"]
+            conf = settings.get("confidence", 0.5)
+            static_mode = fps <= 0 or settings["sample_rate"] / fps > TRACKING_MAX_GAP_SEC
+            
+            estimators = [
+                get_pose_estimator(
+                    settings.get("model_complexity", 0),
+                    settings.get("detection_confidence", 0.7),
+                    settings.get("tracking_confidence", 0.3), w,
+                    settings.get("pose_input_size", 480), static_mode,
+                )
+                for w in range(POSE_WORKERS if static_mode else 1)
+            ]
+            window_size = POSE_WORKERS * POSE_WINDOW_PER_WORKER
+            
+            # Three-stage pipeline: a background thread decodes ahead, pose
+            # inference for the next window runs while this thread computes
+            # metrics and the encoder pool encodes the current one. The overlay
+            # is drawn later, only for frames actually viewed (see
+            # get_display_frames).
+            # The decode queue holds a whole window rather than one or two
+            # frames, so the next window is ready as soon as inference is.
+            sampled = prefetch(
+                sample_frames(
+                    video_source, settings["sample_rate"], settings["max_frames"],
+                    max_width=FRAME_MAX_WIDTH,
+                ),
+                maxsize=window_size,
+            )
+            
+            def next_window() -> list:
+                return list(islice(sampled, window_size))
             
-            for i, (frame_idx, frame_rgb) in enumerate(sample_frames(
-                video_path, settings["sample_rate"], settings["max_frames"]
-            )):
-                prog = min((i + 1) / max(total, 1), 1.0)
-                progress.progress(prog)
-                status.text(f"Analyzing frame {frame_idx}... ({i + 1}/{total})")
+            with closing(sampled), get_pose_lock(), \
+                    ThreadPoolExecutor(max_workers=1) as pose_stage, \
+                    ThreadPoolExecutor(max_workers=ENCODE_WORKERS) as encode_pool:
                 
-                result = estimator.process_frame(frame_rgb)
+                # The cached models outlive a clip; don't track into this one
+                # from wherever the previous clip left off
+                if not static_mode:
+                    for estimator in estimators:
+                        estimator.reset()
                 
-                if result:
-                    metrics = compute_frame_metrics(
-                        frame_idx, props["fps"], result.landmarks,
-                        target_config, settings.get("confidence", 0.5)
+                def submit_poses(window: list):
+                    return pose_stage.submit(
+                        estimate_poses_parallel, [f for _, f in window], estimators
                     )
+                
+                window = next_window()
+                pending = submit_poses(window) if window else None
+                
+                last_pct = 0
+                last_status = -STATUS_INTERVAL_SEC
+                
+                while window:
+                    now = time.monotonic()
+                    if now - last_status >= STATUS_INTERVAL_SEC:
+                        status.text(
+                            f"Analyzing frames {window[0][0]}-{window[-1][0]}... "
+                            f"({len(frames) + len(window)}/{total})"
+                        )
+                        last_status = now
+                    results = pending.result()
                     
-                    annotated = annotate_frame(
-                        frame_rgb, result.landmarks, metrics.angles, metrics.phase,
-                        frame_idx, metrics.timestamp_sec,
-                        draw_angles=settings.get("show_angles", False),
-                        draw_info=True,
-                        visibility_threshold=settings.get("confidence", 0.5)
-                    )
+                    upcoming = next_window()
+                    if upcoming:
+                        pending = submit_poses(upcoming)
                     
-                    frames.append(annotated)
-                    metrics_list.append(metrics)
-                else:
-                    frames.append(frame_rgb)
-        
-        cleanup_temp_file(video_path)
+                    encoded = encode_pool.map(encode_frame_jpeg, [f for _, f in window])
+                    
+                    # Angle math for every usable pose in the window at once
+                    detected = [
+                        (i, frame_idx, result)
+                        for i, ((frame_idx, _), result) in enumerate(zip(window, results)) if result
+                    ]
+                    landmarks_arr = landmarks_to_array_batch([r.landmarks for _, _, r in detected])
+                    usable = count_visible_joints(landmarks_arr, conf) >= MIN_VISIBLE_JOINTS
+                    for (i, _, _), keep in zip(detected, usable):
+                        if not keep:
+                            results[i] = None
+                    
+                    window_metrics = iter(compute_frame_metrics_batch(
+                        [frame_idx for (_, frame_idx, _), keep in zip(detected, usable) if keep],
+                        fps,
+                        landmarks_arr[usable],
+                        target_config, conf
+                    ))
+                    
+                    frame_indices.extend(frame_idx for frame_idx, _ in window)
+                    for result, jpeg in zip(results, encoded):
+                        overlay = None
+                        if result:
+                            metrics = next(window_metrics)
+                            metrics_list.append(metrics)
+                            overlay = (result.landmarks, metrics)
+                        
+                        frames.append(jpeg)
+                        overlays.append(overlay)
+                    
+                    pct = min(100 * len(frames) // max(total, 1), 100)
+                    if pct != last_pct:
+                        progress.progress(pct)
+                        last_pct = pct
+                    window = upcoming
+        finally:
+            # Also on failure, or a tmpfs copy would hold RAM until reboot
+            if isinstance(video_source, str):
+                cleanup_temp_file(video_source)
         
-        st.session_state.processed_frames = frames
+        st.session_state.encoded_frames = frames
+        st.session_state.frame_indices = np.array(frame_indices, dtype=np.int64)
+        st.session_state.frame_overlays = overlays
+        st.session_state.display_frames = {}
         st.session_state.frame_metrics = metrics_list
+        st.session_state.metrics_version += 1
         st.session_state.aggregated_metrics = aggregate_metrics(metrics_list)
+        st.session_state.aggregated_version = st.session_state.metrics_version
+        st.session_state.angles_soa = build_angles_soa(metrics_list)
+        st.session_state.soa_version = st.session_state.metrics_version
+        st.session_state.scores_cache = {}
         st.session_state.processing_complete = True
         st.session_state.current_frame_idx = 0
         
@@ -967,7 +1111,21 @@ def process_video(uploaded_file, settings: dict):
 # =============================================================================
 # MAIN
 # =============================================================================
+def reset_analysis():
+    """Drop the current analysis so the upload view shows (button callback)."""
+    st.session_state.processing_complete = False
+    st.session_state.encoded_frames = []
+    st.session_state.frame_indices = None
+    st.session_state.frame_overlays = []
+    st.session_state.display_frames = {}
+    st.session_state.frame_metrics = []
+    st.session_state.aggregated_metrics = None
+    st.session_state.metrics_version += 1
+    st.session_state.scores_cache = {}
+
+
 def main():
+    inject_css()
     init_session_state()
     settings = render_sidebar()
     
@@ -977,12 +1135,10 @@ def main():
         st.markdown("---")
         col1, col2, col3 = st.columns([1, 1, 1])
         with col2:
-            if st.button("📹 Analyze New Video", use_container_width=True):
-                st.session_state.processing_complete = False
-                st.session_state.processed_frames = []
-                st.session_state.frame_metrics = []
-                st.session_state.aggregated_metrics = None
-                st.rerun()
+            # As a callback the reset lands before the next run, which then
+            # shows the upload view directly instead of needing st.rerun()
+            st.button("📹 Analyze New Video", use_container_width=True,
+                      on_click=reset_analysis)
     else:
         render_upload_view(settings)
 
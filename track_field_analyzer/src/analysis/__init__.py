@@ -4,17 +4,30 @@ from .angles import (
     calculate_angle,
     calculate_trunk_lean,
     extract_joint_angles,
+    extract_joint_angles_batch,
+    landmarks_to_array,
+    landmarks_to_array_batch,
 )
-from .metrics import FrameMetrics, compute_frame_metrics, aggregate_metrics
-from .phases import detect_sprint_phase, SprintPhase
+from .metrics import (
+    FrameMetrics,
+    compute_frame_metrics,
+    compute_frame_metrics_batch,
+    aggregate_metrics,
+)
+from .phases import detect_sprint_phase, detect_sprint_phases_batch, SprintPhase
 
 __all__ = [
     "calculate_angle",
     "calculate_trunk_lean", 
     "extract_joint_angles",
+    "extract_joint_angles_batch",
+    "landmarks_to_array",
+    "landmarks_to_array_batch",
     "FrameMetrics",
     "compute_frame_metrics",
+    "compute_frame_metrics_batch",
     "aggregate_metrics",
     "detect_sprint_phase",
+    "detect_sprint_phases_batch",
     "SprintPhase",
 ]
@@ -0,0 +1,28 @@
+"""Optional Numba JIT support.
+
+Numba is an optional dependency. When it is not installed, ``njit``
+returns the decorated function unchanged so kernels run as plain Python.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args: Any, **kwargs: Any) -> Callable:
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        
+        def decorator(func: Callable) -> Callable:
+            return func
+        
+        return decorator
+
+
+__all__ = ["njit", "NUMBA_AVAILABLE"]
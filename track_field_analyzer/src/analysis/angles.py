@@ -7,7 +7,8 @@ using pose landmark coordinates. All angles are in degrees.
 from __future__ import annotations
 
 import math
-from typing import TYPE_CHECKING
+from itertools import chain
+from typing import TYPE_CHECKING, Iterable, Sequence
 
 import numpy as np
 
@@ -17,6 +18,7 @@ if TYPE_CHECKING:
 
 # Import landmark indices
 from ..pose.mediapipe_pose import LandmarkIndex
+from ._jit import NUMBA_AVAILABLE, njit
 
 
 def calculate_angle(
@@ -38,38 +40,31 @@ def calculate_angle(
     Returns:
         Angle in degrees [0, 180], or NaN if calculation fails
     """
-    try:
-        # Convert to numpy arrays
-        a = np.array(point_a)
-        b = np.array(point_b)
-        c = np.array(point_c)
-        
-        # Calculate vectors from vertex
-        ba = a - b
-        bc = c - b
-        
-        # Calculate magnitudes
-        mag_ba = np.linalg.norm(ba)
-        mag_bc = np.linalg.norm(bc)
-        
-        # Check for zero-length vectors
-        if mag_ba < 1e-10 or mag_bc < 1e-10:
-            return float("nan")
-        
-        # Calculate cosine of angle using dot product
-        cos_angle = np.dot(ba, bc) / (mag_ba * mag_bc)
-        
-        # Clamp to [-1, 1] to handle floating point errors
-        cos_angle = np.clip(cos_angle, -1.0, 1.0)
-        
-        # Calculate angle in degrees
-        angle_rad = np.arccos(cos_angle)
-        angle_deg = np.degrees(angle_rad)
-        
-        return float(angle_deg)
-    
-    except Exception:
+    # Plain float math: for 2D points NumPy's per-call overhead costs far
+    # more than the arithmetic itself
+    ax, ay = point_a
+    bx, by = point_b
+    cx, cy = point_c
+    
+    # Calculate vectors from vertex
+    bax, bay = ax - bx, ay - by
+    bcx, bcy = cx - bx, cy - by
+    
+    # Check for zero-length vectors (squared magnitudes vs 1e-10 ** 2)
+    sq_ba = bax * bax + bay * bay
+    sq_bc = bcx * bcx + bcy * bcy
+    if sq_ba < 1e-20 or sq_bc < 1e-20:
         return float("nan")
+    
+    # Cosine of the angle, clamped to [-1, 1] against rounding errors
+    # (comparisons rather than min/max, so a NaN coordinate stays NaN)
+    cos_angle = (bax * bcx + bay * bcy) / math.sqrt(sq_ba * sq_bc)
+    if cos_angle > 1.0:
+        cos_angle = 1.0
+    elif cos_angle < -1.0:
+        cos_angle = -1.0
+    
+    return math.degrees(math.acos(cos_angle))
 
 
 def calculate_trunk_lean(
@@ -96,32 +91,26 @@ def calculate_trunk_lean(
         - 0 = perfectly vertical
         - NaN if calculation fails
     """
-    try:
-        # Calculate trunk vector (shoulder relative to hip)
-        dx = shoulder_point[0] - hip_point[0]
-        dy = shoulder_point[1] - hip_point[1]  # Negative when shoulder above hip
-        
-        # Vertical vector points upward in image coords (negative y)
-        # The angle from vertical is the angle of the trunk vector
-        # We measure deviation from vertical (straight up)
-        
-        # Calculate angle from vertical axis
-        # atan2 gives angle from positive x-axis, we want from negative y-axis
-        trunk_length = math.sqrt(dx * dx + dy * dy)
-        
-        if trunk_length < 1e-10:
-            return float("nan")
-        
-        # Angle from vertical: positive dx means forward lean
-        # Since shoulder is above hip, dy is negative
-        # Forward lean means shoulder x > hip x (positive dx)
-        angle_rad = math.atan2(dx, -dy)  # -dy because y-axis is inverted
-        angle_deg = math.degrees(angle_rad)
-        
-        return float(angle_deg)
+    # Calculate trunk vector (shoulder relative to hip)
+    dx = shoulder_point[0] - hip_point[0]
+    dy = shoulder_point[1] - hip_point[1]  # Negative when shoulder above hip
+    
+    # Vertical vector points upward in image coords (negative y)
+    # The angle from vertical is the angle of the trunk vector
+    # We measure deviation from vertical (straight up)
     
-    except Exception:
+    # Calculate angle from vertical axis
+    # atan2 gives angle from positive x-axis, we want from negative y-axis
+    trunk_length = math.sqrt(dx * dx + dy * dy)
+    
+    if trunk_length < 1e-10:
         return float("nan")
+    
+    # Angle from vertical: positive dx means forward lean
+    # Since shoulder is above hip, dy is negative
+    # Forward lean means shoulder x > hip x (positive dx)
+    angle_rad = math.atan2(dx, -dy)  # -dy because y-axis is inverted
+    return math.degrees(angle_rad)
 
 
 def get_midpoint(
@@ -148,6 +137,9 @@ def extract_joint_angles(
     - Elbow angles (arm flexion)
     - Trunk lean (forward/backward angle from vertical)
     
+    Computed by extract_joint_angles_batch on a one-frame stack, so the
+    per-frame and batch paths cannot disagree.
+    
     Args:
         landmarks: List of 33 BlazePose landmarks
         visibility_threshold: Minimum visibility to include landmark
@@ -162,96 +154,8 @@ def extract_joint_angles(
         - left_elbow, right_elbow
         - trunk_lean
     """
-    
-    def get_point(idx: int) -> tuple[float, float] | None:
-        """Get point if visible, else None."""
-        lm = landmarks[idx]
-        if lm.visibility >= visibility_threshold:
-            return (lm.x, lm.y)
-        return None
-    
-    angles: dict[str, float] = {}
-    
-    # === KNEE ANGLES ===
-    # Angle at knee between hip-knee-ankle
-    
-    # Left knee
-    left_hip = get_point(LandmarkIndex.LEFT_HIP)
-    left_knee = get_point(LandmarkIndex.LEFT_KNEE)
-    left_ankle = get_point(LandmarkIndex.LEFT_ANKLE)
-    
-    if all([left_hip, left_knee, left_ankle]):
-        angles["left_knee"] = calculate_angle(left_hip, left_knee, left_ankle)
-    else:
-        angles["left_knee"] = float("nan")
-    
-    # Right knee
-    right_hip = get_point(LandmarkIndex.RIGHT_HIP)
-    right_knee = get_point(LandmarkIndex.RIGHT_KNEE)
-    right_ankle = get_point(LandmarkIndex.RIGHT_ANKLE)
-    
-    if all([right_hip, right_knee, right_ankle]):
-        angles["right_knee"] = calculate_angle(right_hip, right_knee, right_ankle)
-    else:
-        angles["right_knee"] = float("nan")
-    
-    # === HIP ANGLES ===
-    # Angle at hip between shoulder-hip-knee
-    
-    # Left hip
-    left_shoulder = get_point(LandmarkIndex.LEFT_SHOULDER)
-    
-    if all([left_shoulder, left_hip, left_knee]):
-        angles["left_hip"] = calculate_angle(left_shoulder, left_hip, left_knee)
-    else:
-        angles["left_hip"] = float("nan")
-    
-    # Right hip
-    right_shoulder = get_point(LandmarkIndex.RIGHT_SHOULDER)
-    
-    if all([right_shoulder, right_hip, right_knee]):
-        angles["right_hip"] = calculate_angle(right_shoulder, right_hip, right_knee)
-    else:
-        angles["right_hip"] = float("nan")
-    
-    # === ELBOW ANGLES ===
-    # Angle at elbow between shoulder-elbow-wrist
-    
-    # Left elbow
-    left_elbow = get_point(LandmarkIndex.LEFT_ELBOW)
-    left_wrist = get_point(LandmarkIndex.LEFT_WRIST)
-    
-    if all([left_shoulder, left_elbow, left_wrist]):
-        angles["left_elbow"] = calculate_angle(left_shoulder, left_elbow, left_wrist)
-    else:
-        angles["left_elbow"] = float("nan")
-    
-    # Right elbow
-    right_elbow = get_point(LandmarkIndex.RIGHT_ELBOW)
-    right_wrist = get_point(LandmarkIndex.RIGHT_WRIST)
-    
-    if all([right_shoulder, right_elbow, right_wrist]):
-        angles["right_elbow"] = calculate_angle(right_shoulder, right_elbow, right_wrist)
-    else:
-        angles["right_elbow"] = float("nan")
-    
-    # === TRUNK LEAN ===
-    # Angle of torso from vertical
-    
-    if all([left_hip, right_hip, left_shoulder, right_shoulder]):
-        hip_mid = get_midpoint(
-            landmarks[LandmarkIndex.LEFT_HIP],
-            landmarks[LandmarkIndex.RIGHT_HIP],
-        )
-        shoulder_mid = get_midpoint(
-            landmarks[LandmarkIndex.LEFT_SHOULDER],
-            landmarks[LandmarkIndex.RIGHT_SHOULDER],
-        )
-        angles["trunk_lean"] = calculate_trunk_lean(hip_mid, shoulder_mid)
-    else:
-        angles["trunk_lean"] = float("nan")
-    
-    return angles
+    angles = extract_joint_angles_batch(landmarks_to_array(landmarks), visibility_threshold)
+    return {name: float(values[0]) for name, values in angles.items()}
 
 
 def get_hip_height_normalized(
@@ -275,3 +179,206 @@ def get_hip_height_normalized(
         return (left_hip.y + right_hip.y) / 2
     
     return float("nan")
+
+
+# Joint angles as (name, point_a, vertex, point_c), in extract_joint_angles order
+JOINT_ANGLE_TRIPLES = (
+    ("left_knee", LandmarkIndex.LEFT_HIP, LandmarkIndex.LEFT_KNEE, LandmarkIndex.LEFT_ANKLE),
+    ("right_knee", LandmarkIndex.RIGHT_HIP, LandmarkIndex.RIGHT_KNEE, LandmarkIndex.RIGHT_ANKLE),
+    ("left_hip", LandmarkIndex.LEFT_SHOULDER, LandmarkIndex.LEFT_HIP, LandmarkIndex.LEFT_KNEE),
+    ("right_hip", LandmarkIndex.RIGHT_SHOULDER, LandmarkIndex.RIGHT_HIP, LandmarkIndex.RIGHT_KNEE),
+    ("left_elbow", LandmarkIndex.LEFT_SHOULDER, LandmarkIndex.LEFT_ELBOW, LandmarkIndex.LEFT_WRIST),
+    ("right_elbow", LandmarkIndex.RIGHT_SHOULDER, LandmarkIndex.RIGHT_ELBOW, LandmarkIndex.RIGHT_WRIST),
+)
+
+
+# The same triples as a (joint, point) index array for batched gathers
+_TRIPLE_INDEX = np.array([points for _, *points in JOINT_ANGLE_TRIPLES], dtype=np.intp)
+
+
+# Every landmark any joint angle or the trunk lean is computed from
+ANALYSIS_LANDMARKS = np.array(
+    sorted({idx for _, *points in JOINT_ANGLE_TRIPLES for idx in points}), dtype=np.intp
+)
+
+
+def count_visible_joints(
+    landmarks_arr: np.ndarray,
+    visibility_threshold: float = 0.5,
+) -> np.ndarray:
+    """Count ANALYSIS_LANDMARKS at or above the threshold in each (N, 33, 4) frame."""
+    landmarks_arr = np.asarray(landmarks_arr).reshape(-1, 33, 4)
+    return (landmarks_arr[:, ANALYSIS_LANDMARKS, 3] >= visibility_threshold).sum(axis=1)
+
+
+def _pack_landmarks(landmarks: Iterable["Landmark"], count: int) -> np.ndarray:
+    """Flat float64 array of x, y, z, visibility for count landmarks."""
+    # fromiter fills one preallocated buffer, with no per-landmark tuple
+    # list or per-frame array to stack afterwards. float64, not float32:
+    # the angle code works in float64 and would otherwise cast a copy.
+    return np.fromiter(
+        chain.from_iterable((lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks),
+        dtype=np.float64, count=4 * count,
+    )
+
+
+def landmarks_to_array(landmarks: list["Landmark"]) -> np.ndarray:
+    """Pack landmarks into a (33, 4) float64 array of x, y, z, visibility."""
+    return _pack_landmarks(landmarks, len(landmarks)).reshape(-1, 4)
+
+
+def landmarks_to_array_batch(landmark_lists: Sequence[list["Landmark"]]) -> np.ndarray:
+    """Pack several frames' landmarks into one (N, 33, 4) float64 array."""
+    flat = _pack_landmarks(chain.from_iterable(landmark_lists), 33 * len(landmark_lists))
+    return flat.reshape(-1, 33, 4)
+
+
+def extract_joint_angles_batch(
+    landmarks_arr: np.ndarray,
+    visibility_threshold: float = 0.5,
+) -> dict[str, np.ndarray]:
+    """
+    Vectorized extract_joint_angles over a stack of frames.
+    
+    Args:
+        landmarks_arr: (N, 33, 4) array from landmarks_to_array
+        visibility_threshold: Minimum visibility to include landmark
+        
+    Returns:
+        Dictionary of angle names to (N,) float64 arrays in degrees,
+        with the same keys and NaN rules as extract_joint_angles.
+    """
+    landmarks_arr = np.asarray(landmarks_arr, dtype=np.float64).reshape(-1, 33, 4)
+    
+    if NUMBA_AVAILABLE:
+        table = _angles_kernel(
+            np.ascontiguousarray(landmarks_arr), _TRIPLE_INDEX, _TRUNK_INDEX,
+            float(visibility_threshold),
+        )
+    else:
+        table = _angles_numpy(landmarks_arr, visibility_threshold)
+    
+    return {name: table[:, j] for j, name in enumerate(_ANGLE_NAMES)}
+
+
+# Columns of the (N, 7) tables built by _angles_numpy and _angles_kernel
+_ANGLE_NAMES = tuple(name for name, *_ in JOINT_ANGLE_TRIPLES) + ("trunk_lean",)
+
+# Hip and shoulder landmarks the trunk lean is computed from
+_TRUNK_INDEX = np.array([
+    LandmarkIndex.LEFT_HIP, LandmarkIndex.RIGHT_HIP,
+    LandmarkIndex.LEFT_SHOULDER, LandmarkIndex.RIGHT_SHOULDER,
+], dtype=np.intp)
+
+
+def _angles_numpy(landmarks_arr: np.ndarray, visibility_threshold: float) -> np.ndarray:
+    """Angle table for an (N, 33, 4) stack using whole-array NumPy operations."""
+    xy = landmarks_arr[..., :2]
+    visible = landmarks_arr[..., 3] >= visibility_threshold
+    table = np.empty((landmarks_arr.shape[0], len(_ANGLE_NAMES)))
+    
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # All joints of all frames at once: (N, joint, point, xy)
+        pts = xy[:, _TRIPLE_INDEX]
+        ba = pts[:, :, 0] - pts[:, :, 1]
+        bc = pts[:, :, 2] - pts[:, :, 1]
+        mag_ba = np.sqrt(np.einsum("njk,njk->nj", ba, ba))
+        mag_bc = np.sqrt(np.einsum("njk,njk->nj", bc, bc))
+        
+        cos_angle = np.einsum("njk,njk->nj", ba, bc) / (mag_ba * mag_bc)
+        degrees = np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0)))
+        
+        valid = (
+            visible[:, _TRIPLE_INDEX].all(axis=2)
+            & (mag_ba >= 1e-10) & (mag_bc >= 1e-10)
+        )
+        table[:, :-1] = np.where(valid, degrees, np.nan)
+        
+        # Trunk lean from hip midpoint to shoulder midpoint
+        hip_mid = (xy[:, LandmarkIndex.LEFT_HIP] + xy[:, LandmarkIndex.RIGHT_HIP]) / 2
+        shoulder_mid = (
+            xy[:, LandmarkIndex.LEFT_SHOULDER] + xy[:, LandmarkIndex.RIGHT_SHOULDER]
+        ) / 2
+        dx = shoulder_mid[:, 0] - hip_mid[:, 0]
+        dy = shoulder_mid[:, 1] - hip_mid[:, 1]
+        
+        valid = (
+            visible[:, _TRUNK_INDEX].all(axis=1)
+            & (np.sqrt(dx * dx + dy * dy) >= 1e-10)
+        )
+        table[:, -1] = np.where(valid, np.degrees(np.arctan2(dx, -dy)), np.nan)
+    
+    return table
+
+
+# Same arithmetic, in the same order, as _angles_numpy, without the
+# temporary arrays. No fastmath: NaN visibility or coordinates must give
+# NaN angles, and "not (v >= t)" is how a NaN visibility fails the check.
+@njit(cache=True)
+def _angles_kernel(
+    landmarks_arr: np.ndarray,
+    triple_index: np.ndarray,
+    trunk_index: np.ndarray,
+    visibility_threshold: float,
+) -> np.ndarray:
+    n = landmarks_arr.shape[0]
+    n_joints = triple_index.shape[0]
+    table = np.full((n, n_joints + 1), np.nan)
+    
+    for i in range(n):
+        lm = landmarks_arr[i]
+        
+        for j in range(n_joints):
+            a = triple_index[j, 0]
+            b = triple_index[j, 1]
+            c = triple_index[j, 2]
+            if not (lm[a, 3] >= visibility_threshold and lm[b, 3] >= visibility_threshold
+                    and lm[c, 3] >= visibility_threshold):
+                continue
+            
+            bax = lm[a, 0] - lm[b, 0]
+            bay = lm[a, 1] - lm[b, 1]
+            bcx = lm[c, 0] - lm[b, 0]
+            bcy = lm[c, 1] - lm[b, 1]
+            mag_ba = np.sqrt(bax * bax + bay * bay)
+            mag_bc = np.sqrt(bcx * bcx + bcy * bcy)
+            if not (mag_ba >= 1e-10 and mag_bc >= 1e-10):
+                continue
+            
+            cos_angle = (bax * bcx + bay * bcy) / (mag_ba * mag_bc)
+            if cos_angle > 1.0:
+                cos_angle = 1.0
+            elif cos_angle < -1.0:
+                cos_angle = -1.0
+            table[i, j] = np.degrees(np.arccos(cos_angle))
+        
+        visible = True
+        for k in range(trunk_index.shape[0]):
+            if not (lm[trunk_index[k], 3] >= visibility_threshold):
+                visible = False
+        if not visible:
+            continue
+        
+        lh = trunk_index[0]
+        rh = trunk_index[1]
+        ls = trunk_index[2]
+        rs = trunk_index[3]
+        dx = (lm[ls, 0] + lm[rs, 0]) / 2 - (lm[lh, 0] + lm[rh, 0]) / 2
+        dy = (lm[ls, 1] + lm[rs, 1]) / 2 - (lm[lh, 1] + lm[rh, 1]) / 2
+        if np.sqrt(dx * dx + dy * dy) >= 1e-10:
+            table[i, n_joints] = np.degrees(np.arctan2(dx, -dy))
+    
+    return table
+
+
+def get_hip_height_batch(
+    landmarks_arr: np.ndarray,
+    visibility_threshold: float = 0.5,
+) -> np.ndarray:
+    """Vectorized get_hip_height_normalized over a (N, 33, 4) landmark stack."""
+    landmarks_arr = np.asarray(landmarks_arr, dtype=np.float64).reshape(-1, 33, 4)
+    left_hip = landmarks_arr[:, LandmarkIndex.LEFT_HIP]
+    right_hip = landmarks_arr[:, LandmarkIndex.RIGHT_HIP]
+    
+    visible = (left_hip[:, 3] >= visibility_threshold) & (right_hip[:, 3] >= visibility_threshold)
+    return np.where(visible, (left_hip[:, 1] + right_hip[:, 1]) / 2, np.nan)
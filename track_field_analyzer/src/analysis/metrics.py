@@ -6,15 +6,32 @@ video sequences, including feedback generation.
 
 from __future__ import annotations
 
+import copy
 import math
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
 import yaml
 
-from .angles import extract_joint_angles, get_hip_height_normalized
-from .phases import SprintPhase, detect_sprint_phase
+from .angles import (
+    extract_joint_angles,
+    extract_joint_angles_batch,
+    get_hip_height_batch,
+    get_hip_height_normalized,
+)
+from .phases import (
+    PHASE_INDEX,
+    PHASE_ORDER,
+    SprintPhase,
+    detect_sprint_phase,
+    detect_sprint_phases_batch,
+)
+
+# libyaml's C parser when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 if TYPE_CHECKING:
     from ..pose.mediapipe_pose import Landmark
@@ -54,6 +71,10 @@ def load_target_ranges(config_path: str | Path | None = None) -> dict:
     """
     Load target angle ranges from config file.
     
+    Parsed files are cached by path and modification time, so repeat
+    calls skip the YAML parse and an edited file is re-read. Each call
+    returns its own deep copy, so callers may modify the result.
+    
     Args:
         config_path: Path to targets.yaml, or None to use default
         
@@ -77,8 +98,39 @@ def load_target_ranges(config_path: str | Path | None = None) -> dict:
             }
         }
     
-    with open(config_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    config_path = config_path.resolve()
+    parsed = _parse_target_ranges(str(config_path), config_path.stat().st_mtime_ns)
+    return copy.deepcopy(parsed)
+
+
+@lru_cache(maxsize=4)
+def _parse_target_ranges(path: str, mtime_ns: int) -> dict:
+    """Parse a targets file; mtime_ns is part of the cache key only.
+    
+    The result is shared by every cache hit and must not be modified;
+    load_target_ranges hands out copies.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
+# Map phase to config key
+_PHASE_CONFIG_KEYS = {
+    SprintPhase.SET: "set_position",
+    SprintPhase.DRIVE: "drive_phase",
+    SprintPhase.ACCELERATION: "acceleration",
+    SprintPhase.MAX_VELOCITY: "max_velocity",
+}
+
+
+def _phase_targets(phase: SprintPhase, target_config: dict) -> dict | None:
+    """Targets dict configured for phase, or None for UNKNOWN."""
+    phase_key = _PHASE_CONFIG_KEYS.get(phase)
+    if phase_key is None:
+        return None
+    phases_config = target_config.get("phases", {})
+    phase_config = phases_config.get(phase_key, {})
+    return phase_config.get("targets", {})
 
 
 def generate_feedback(
@@ -99,22 +151,10 @@ def generate_feedback(
     """
     feedback = []
     
-    # Map phase to config key
-    phase_config_map = {
-        SprintPhase.SET: "set_position",
-        SprintPhase.DRIVE: "drive_phase",
-        SprintPhase.ACCELERATION: "acceleration",
-        SprintPhase.MAX_VELOCITY: "max_velocity",
-    }
-    
-    phase_key = phase_config_map.get(phase)
-    if phase_key is None:
-        return feedback
-    
     # Get targets for this phase
-    phases_config = target_config.get("phases", {})
-    phase_config = phases_config.get(phase_key, {})
-    targets = phase_config.get("targets", {})
+    targets = _phase_targets(phase, target_config)
+    if targets is None:
+        return feedback
     
     # Check trunk lean
     trunk_lean = angles.get("trunk_lean", float("nan"))
@@ -145,11 +185,8 @@ def generate_feedback(
         if phase == SprintPhase.SET:
             knee_targets = targets.get("front_knee_angle", {})
             if knee_targets:
-                # Use the more bent knee as front knee
-                front_knee = min(
-                    left_knee if not math.isnan(left_knee) else 180,
-                    right_knee if not math.isnan(right_knee) else 180
-                )
+                # Use the more bent knee as front knee (fmin skips a NaN side)
+                front_knee = float(np.fmin(left_knee, right_knee))
                 min_val = knee_targets.get("min", 0)
                 max_val = knee_targets.get("max", 180)
                 
@@ -183,6 +220,89 @@ def generate_feedback(
     return feedback
 
 
+def _generate_feedback_batch(
+    angle_columns: dict[str, np.ndarray],
+    phase_codes: np.ndarray,
+    target_config: dict,
+) -> list[list[str]]:
+    """
+    generate_feedback for many frames, one range check per target.
+    
+    Each check compares a whole angle column with the phase's range and
+    only formats messages for frames outside it. Checks run in the same
+    order as in generate_feedback, so each frame's list matches it.
+    NaN compares false both ways, which skips missing angles.
+    
+    Args:
+        angle_columns: Angle name -> per-frame values
+        phase_codes: Per-frame phase codes (positions in PHASE_ORDER)
+        target_config: Loaded target configuration
+        
+    Returns:
+        One feedback list per frame
+    """
+    n = len(phase_codes)
+    feedback: list[list[str]] = [[] for _ in range(n)]
+    
+    def column(name: str) -> np.ndarray:
+        if name not in angle_columns:
+            return np.full(n, np.nan)
+        return np.asarray(angle_columns[name], dtype=np.float64)
+    
+    abs_lean = np.abs(column("trunk_lean"))
+    front_knee = np.fmin(column("left_knee"), column("right_knee"))
+    elbows = [("Left", column("left_elbow")), ("Right", column("right_elbow"))]
+    
+    def check(rows, values, spec, low, high):
+        too_low = rows & (values < spec.get("min", 0))
+        too_high = rows & (values > spec.get("max", 180)) & ~too_low
+        for i in np.flatnonzero(too_low):
+            feedback[i].append(low(float(values[i])))
+        for i in np.flatnonzero(too_high):
+            feedback[i].append(high(float(values[i])))
+    
+    for code, phase in enumerate(PHASE_ORDER):
+        targets = _phase_targets(phase, target_config)
+        rows = phase_codes == code
+        if not targets or not rows.any():
+            continue
+        
+        trunk_targets = targets.get("trunk_lean", {})
+        if trunk_targets:
+            check(
+                rows, abs_lean, trunk_targets,
+                lambda v: trunk_targets.get(
+                    "feedback_low", f"Trunk lean ({v:.0f}°) below target range"
+                ),
+                lambda v: trunk_targets.get(
+                    "feedback_high", f"Trunk lean ({v:.0f}°) above target range"
+                ),
+            )
+        
+        knee_targets = targets.get("front_knee_angle", {})
+        if phase == SprintPhase.SET and knee_targets:
+            check(
+                rows, front_knee, knee_targets,
+                lambda v: knee_targets.get(
+                    "feedback_low", f"Front knee ({v:.0f}°) too closed"
+                ),
+                lambda v: knee_targets.get(
+                    "feedback_high", f"Front knee ({v:.0f}°) too open"
+                ),
+            )
+        
+        arm_targets = targets.get("arm_angle", {})
+        if arm_targets:
+            for side, values in elbows:
+                check(
+                    rows, values, arm_targets,
+                    lambda v, side=side: f"{side} arm too bent ({v:.0f}°)",
+                    lambda v, side=side: f"{side} arm too straight ({v:.0f}°)",
+                )
+    
+    return feedback
+
+
 def compute_frame_metrics(
     frame_index: int,
     fps: float,
@@ -197,7 +317,8 @@ def compute_frame_metrics(
         frame_index: Frame number in video
         fps: Video frames per second
         landmarks: Pose landmarks from MediaPipe
-        target_config: Target ranges config (loaded via load_target_ranges)
+        target_config: Target ranges config (loaded via load_target_ranges);
+                       None loads the default config (see load_target_ranges)
         visibility_threshold: Minimum landmark visibility
         
     Returns:
@@ -220,10 +341,7 @@ def compute_frame_metrics(
     right_knee = angles.get("right_knee", float("nan"))
     front_knee = None
     if not math.isnan(left_knee) or not math.isnan(right_knee):
-        front_knee = min(
-            left_knee if not math.isnan(left_knee) else 180,
-            right_knee if not math.isnan(right_knee) else 180
-        )
+        front_knee = float(np.fmin(left_knee, right_knee))
     
     phase = detect_sprint_phase(
         trunk_lean=trunk_lean,
@@ -231,10 +349,83 @@ def compute_frame_metrics(
         knee_angle_front=front_knee,
     )
     
-    # Generate feedback
     if target_config is None:
         target_config = load_target_ranges()
     
+    return _build_frame_metrics(
+        frame_index, timestamp_sec, angles, hip_height, phase, target_config
+    )
+
+
+def compute_frame_metrics_batch(
+    frame_indices: list[int],
+    fps: float,
+    landmarks_arr: np.ndarray,
+    target_config: dict | None = None,
+    visibility_threshold: float = 0.5,
+) -> list[FrameMetrics]:
+    """
+    Compute metrics for a stack of frames at once.
+    
+    Joint angles, hip heights, phases and feedback are computed with
+    array math over all frames, with the same results as
+    compute_frame_metrics.
+    
+    Args:
+        frame_indices: Frame number of each row in landmarks_arr
+        fps: Video frames per second
+        landmarks_arr: (N, 33, 4) array of x, y, z, visibility
+            (see landmarks_to_array)
+        target_config: Target ranges config (loaded via load_target_ranges);
+                       None loads the default config (see load_target_ranges)
+        visibility_threshold: Minimum landmark visibility
+        
+    Returns:
+        One FrameMetrics per frame, in input order
+    """
+    if len(frame_indices) == 0:
+        return []
+    
+    angle_columns = extract_joint_angles_batch(landmarks_arr, visibility_threshold)
+    hip_heights = get_hip_height_batch(landmarks_arr, visibility_threshold)
+    phase_codes = detect_sprint_phases_batch(
+        angle_columns["trunk_lean"],
+        hip_heights,
+        np.fmin(angle_columns["left_knee"], angle_columns["right_knee"]),
+    )
+    
+    if target_config is None:
+        target_config = load_target_ranges()
+    
+    feedback = _generate_feedback_batch(angle_columns, phase_codes, target_config)
+    names = list(angle_columns)
+    rows = zip(*(angle_columns[name].tolist() for name in names))
+    
+    return [
+        FrameMetrics(
+            frame_index=frame_index,
+            timestamp_sec=frame_index / fps if fps > 0 else 0.0,
+            angles=dict(zip(names, row)),
+            hip_height=hip_height,
+            phase=PHASE_ORDER[code],
+            feedback=frame_feedback,
+        )
+        for frame_index, row, hip_height, code, frame_feedback in zip(
+            frame_indices, rows, hip_heights.tolist(), phase_codes.tolist(), feedback
+        )
+    ]
+
+
+def _build_frame_metrics(
+    frame_index: int,
+    timestamp_sec: float,
+    angles: dict[str, float],
+    hip_height: float,
+    phase: SprintPhase,
+    target_config: dict,
+) -> FrameMetrics:
+    """Generate feedback and assemble FrameMetrics for one frame."""
+    # Generate feedback
     feedback = generate_feedback(angles, phase, target_config)
     
     return FrameMetrics(
@@ -254,6 +445,8 @@ def aggregate_metrics(
     Aggregate metrics across all processed frames.
     
     Computes statistics like averages, min/max, and phase distribution.
+    Angles are stacked into one (frames, angles) array and reduced per
+    column with NaN-aware NumPy reductions.
     
     Args:
         frame_metrics_list: List of FrameMetrics from each processed frame
@@ -277,49 +470,45 @@ def aggregate_metrics(
             "overall_feedback": [],
         }
     
-    # Collect angle values
-    angle_values: dict[str, list[float]] = {}
-    for fm in frame_metrics_list:
-        for name, value in fm.angles.items():
-            if not math.isnan(value):
-                if name not in angle_values:
-                    angle_values[name] = []
-                angle_values[name].append(value)
-    
-    # Calculate statistics
-    avg_angles = {
-        name: sum(values) / len(values)
-        for name, values in angle_values.items()
-        if values
-    }
-    min_angles = {
-        name: min(values)
-        for name, values in angle_values.items()
-        if values
-    }
-    max_angles = {
-        name: max(values)
-        for name, values in angle_values.items()
-        if values
+    # Angle names in first-seen order, as columns of one array
+    names = list(dict.fromkeys(
+        name for fm in frame_metrics_list for name in fm.angles
+    ))
+    nan = float("nan")
+    angles = np.array(
+        [[fm.angles.get(name, nan) for name in names] for fm in frame_metrics_list],
+        dtype=np.float64,
+    ).reshape(len(frame_metrics_list), len(names))
+    
+    # Angles never measured in any frame are left out
+    measured = ~np.isnan(angles).all(axis=0)
+    names = [name for name, keep in zip(names, measured) if keep]
+    angles = angles[:, measured]
+    avg = np.nanmean(angles, axis=0)
+    low = np.nanmin(angles, axis=0)
+    high = np.nanmax(angles, axis=0)
+    
+    # Phase distribution, in order of first appearance
+    codes = np.fromiter(
+        (PHASE_INDEX[fm.phase] for fm in frame_metrics_list),
+        dtype=np.int8, count=len(frame_metrics_list),
+    )
+    counts = np.bincount(codes, minlength=len(PHASE_ORDER))
+    present, first_seen = np.unique(codes, return_index=True)
+    phase_counts = {
+        PHASE_ORDER[code].value: int(counts[code])
+        for code in present[np.argsort(first_seen)]
     }
     
-    # Phase distribution
-    phase_counts: dict[str, int] = {}
-    for fm in frame_metrics_list:
-        phase_name = fm.phase.value
-        phase_counts[phase_name] = phase_counts.get(phase_name, 0) + 1
-    
     # Phase sequence (transitions)
-    phase_sequence = []
-    prev_phase = None
-    for fm in frame_metrics_list:
-        if fm.phase != prev_phase:
-            phase_sequence.append({
-                "phase": fm.phase.value,
-                "start_frame": fm.frame_index,
-                "timestamp": fm.timestamp_sec,
-            })
-            prev_phase = fm.phase
+    phase_sequence = [
+        {
+            "phase": frame_metrics_list[i].phase.value,
+            "start_frame": int(frame_metrics_list[i].frame_index),
+            "timestamp": float(frame_metrics_list[i].timestamp_sec),
+        }
+        for i in np.flatnonzero(np.diff(codes, prepend=-1))
+    ]
     
     # Collect unique feedback
     all_feedback = set()
@@ -327,9 +516,9 @@ def aggregate_metrics(
         all_feedback.update(fm.feedback)
     
     return {
-        "avg_angles": {k: round(v, 1) for k, v in avg_angles.items()},
-        "min_angles": {k: round(v, 1) for k, v in min_angles.items()},
-        "max_angles": {k: round(v, 1) for k, v in max_angles.items()},
+        "avg_angles": {k: round(float(v), 1) for k, v in zip(names, avg)},
+        "min_angles": {k: round(float(v), 1) for k, v in zip(names, low)},
+        "max_angles": {k: round(float(v), 1) for k, v in zip(names, high)},
         "phase_distribution": phase_counts,
         "phase_sequence": phase_sequence,
         "overall_feedback": sorted(all_feedback),
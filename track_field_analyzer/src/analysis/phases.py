@@ -12,6 +12,10 @@ from __future__ import annotations
 from enum import Enum
 from typing import TYPE_CHECKING
 
+import numpy as np
+
+from ._jit import njit
+
 if TYPE_CHECKING:
     from ..pose.mediapipe_pose import Landmark
 
@@ -28,26 +32,35 @@ class SprintPhase(Enum):
     @property
     def display_name(self) -> str:
         """Human-readable phase name."""
-        names = {
-            SprintPhase.SET: "Set Position",
-            SprintPhase.DRIVE: "Drive Phase",
-            SprintPhase.ACCELERATION: "Acceleration",
-            SprintPhase.MAX_VELOCITY: "Max Velocity",
-            SprintPhase.UNKNOWN: "Unknown",
-        }
-        return names[self]
+        return _DISPLAY_NAMES[self]
     
     @property
     def color(self) -> tuple[int, int, int]:
         """RGB color for visualization."""
-        colors = {
-            SprintPhase.SET: (255, 100, 100),       # Red-ish
-            SprintPhase.DRIVE: (255, 165, 0),       # Orange
-            SprintPhase.ACCELERATION: (255, 255, 0), # Yellow
-            SprintPhase.MAX_VELOCITY: (100, 255, 100), # Green
-            SprintPhase.UNKNOWN: (150, 150, 150),    # Gray
-        }
-        return colors[self]
+        return _COLORS[self]
+
+
+_DISPLAY_NAMES = {
+    SprintPhase.SET: "Set Position",
+    SprintPhase.DRIVE: "Drive Phase",
+    SprintPhase.ACCELERATION: "Acceleration",
+    SprintPhase.MAX_VELOCITY: "Max Velocity",
+    SprintPhase.UNKNOWN: "Unknown",
+}
+
+_COLORS = {
+    SprintPhase.SET: (255, 100, 100),       # Red-ish
+    SprintPhase.DRIVE: (255, 165, 0),       # Orange
+    SprintPhase.ACCELERATION: (255, 255, 0), # Yellow
+    SprintPhase.MAX_VELOCITY: (100, 255, 100), # Green
+    SprintPhase.UNKNOWN: (150, 150, 150),    # Gray
+}
+
+
+# Fixed phase order for array-based code: PHASE_INDEX maps a phase to
+# its integer code (its position in PHASE_ORDER)
+PHASE_ORDER = tuple(SprintPhase)
+PHASE_INDEX = {phase: i for i, phase in enumerate(PHASE_ORDER)}
 
 
 # Default thresholds for phase detection
@@ -167,6 +180,107 @@ def detect_sprint_phase(
     return SprintPhase.UNKNOWN
 
 
+def _threshold_vector(thresholds: dict | None) -> np.ndarray:
+    """Flatten a thresholds dict into the layout _phase_kernel reads."""
+    t = thresholds or DEFAULT_THRESHOLDS
+    set_thresh = t.get("set", DEFAULT_THRESHOLDS["set"])
+    drive_thresh = t.get("drive", DEFAULT_THRESHOLDS["drive"])
+    accel_thresh = t.get("acceleration", DEFAULT_THRESHOLDS["acceleration"])
+    max_vel_thresh = t.get("max_velocity", DEFAULT_THRESHOLDS["max_velocity"])
+    
+    return np.array([
+        set_thresh.get("max_hip_height", 0.55),
+        set_thresh.get("min_trunk_lean", 40),
+        drive_thresh.get("min_hip_height", 0.45),
+        drive_thresh.get("max_hip_height", 0.65),
+        drive_thresh.get("min_trunk_lean", 25),
+        drive_thresh.get("max_trunk_lean", 50),
+        accel_thresh.get("min_hip_height", 0.35),
+        accel_thresh.get("max_hip_height", 0.55),
+        accel_thresh.get("min_trunk_lean", 10),
+        accel_thresh.get("max_trunk_lean", 35),
+        max_vel_thresh.get("max_hip_height", 0.45),
+        max_vel_thresh.get("max_trunk_lean", 20),
+    ], dtype=np.float64)
+
+
+# Same checks, in the same order, as detect_sprint_phase. No fastmath:
+# NaN inputs must fall through to UNKNOWN.
+@njit(cache=True)
+def _phase_kernel(
+    trunk_lean: np.ndarray,
+    hip_height: np.ndarray,
+    front_knee: np.ndarray,
+    t: np.ndarray,
+    codes: np.ndarray,
+) -> np.ndarray:
+    n = trunk_lean.shape[0]
+    out = np.empty(n, dtype=np.int8)
+    
+    for i in range(n):
+        lean = abs(trunk_lean[i])
+        hip = hip_height[i]
+        knee = front_knee[i]
+        
+        if np.isnan(lean) or np.isnan(hip):
+            out[i] = codes[4]
+        elif hip >= t[0] and lean >= t[1] and (np.isnan(knee) or 80 <= knee <= 120):
+            out[i] = codes[0]
+        elif t[2] <= hip <= t[3] and t[4] <= lean <= t[5]:
+            out[i] = codes[1]
+        elif t[6] <= hip <= t[7] and t[8] <= lean <= t[9]:
+            out[i] = codes[2]
+        elif hip <= t[10] and lean <= t[11]:
+            out[i] = codes[3]
+        else:
+            out[i] = codes[4]
+    
+    return out
+
+
+# Kernel outputs for set, drive, acceleration, max velocity, unknown
+_KERNEL_CODES = np.array([
+    PHASE_INDEX[SprintPhase.SET],
+    PHASE_INDEX[SprintPhase.DRIVE],
+    PHASE_INDEX[SprintPhase.ACCELERATION],
+    PHASE_INDEX[SprintPhase.MAX_VELOCITY],
+    PHASE_INDEX[SprintPhase.UNKNOWN],
+], dtype=np.int8)
+
+
+def detect_sprint_phases_batch(
+    trunk_lean: np.ndarray,
+    hip_height_normalized: np.ndarray,
+    knee_angle_front: np.ndarray | None = None,
+    thresholds: dict | None = None,
+) -> np.ndarray:
+    """
+    Vectorized detect_sprint_phase over per-frame arrays.
+    
+    Args:
+        trunk_lean: Forward lean angles in degrees
+        hip_height_normalized: Hip y-coordinates [0=top, 1=bottom]
+        knee_angle_front: Optional front knee angles; NaN entries are
+            treated like knee_angle_front=None
+        thresholds: Optional custom thresholds dict
+        
+    Returns:
+        int8 array of phase codes (positions in PHASE_ORDER)
+    """
+    trunk_lean = np.ascontiguousarray(trunk_lean, dtype=np.float64)
+    hip_height = np.ascontiguousarray(hip_height_normalized, dtype=np.float64)
+    
+    if knee_angle_front is None:
+        front_knee = np.full(trunk_lean.shape, np.nan)
+    else:
+        front_knee = np.ascontiguousarray(knee_angle_front, dtype=np.float64)
+    
+    return _phase_kernel(
+        trunk_lean, hip_height, front_knee,
+        _threshold_vector(thresholds), _KERNEL_CODES,
+    )
+
+
 def get_phase_description(phase: SprintPhase) -> str:
     """Get a description of what characterizes each phase."""
     descriptions = {
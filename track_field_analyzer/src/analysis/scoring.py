@@ -0,0 +1,117 @@
+"""Overall form scoring (0-10) for the dashboard hero score.
+
+Scores all frames at once from per-angle column arrays. The per-frame
+loop is JIT-compiled when Numba is installed.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from ._jit import njit
+from .phases import PHASE_INDEX, SprintPhase
+
+
+# Trunk lean bands per phase: [inner_lo, inner_hi, outer_lo, outer_hi]
+TRUNK_BANDS = np.array([
+    [40, 55, 30, 60],              # Set
+    [30, 50, 20, 55],              # Drive
+    [15, 35, 10, 40],              # Acceleration
+    [0, 15, 0, 25],                # Max velocity
+    [np.nan] * 4,                  # Unknown (no trunk points)
+], dtype=np.float32)
+
+# Points awarded for landing in the inner / outer band
+TRUNK_POINTS = np.array([
+    [2.0, 1.0],
+    [2.5, 1.5],
+    [2.0, 1.0],
+    [2.5, 1.5],
+    [0.0, 0.0],
+], dtype=np.float32)
+
+# Summary note when the inner band is hit (empty = no note)
+TRUNK_NOTES = ("good forward lean", "strong drive angle", "", "good upright posture", "")
+
+# Hero rating breakpoints: below 5 is poor, below 7 okay, otherwise good
+SCORE_RATING_BREAKS = np.array([5.0, 7.0], dtype=np.float32)
+SCORE_RATINGS = np.array(["poor", "okay", "good"])
+
+
+# No fastmath: the comparisons below rely on NaN never matching a band.
+@njit(cache=True)
+def _score_kernel(
+    trunk_lean: np.ndarray,
+    left_knee: np.ndarray,
+    right_knee: np.ndarray,
+    phase_idx: np.ndarray,
+    bands: np.ndarray,
+    points: np.ndarray,
+    unknown_idx: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    n = trunk_lean.shape[0]
+    scores = np.empty(n, dtype=np.float32)
+    inner_hit = np.zeros(n, dtype=np.bool_)
+    
+    for i in range(n):
+        p = phase_idx[i]
+        trunk = abs(trunk_lean[i])
+        score = 5.0
+        
+        # Phase-appropriate trunk lean scoring
+        if bands[p, 0] <= trunk <= bands[p, 1]:
+            score += points[p, 0]
+            inner_hit[i] = True
+        elif bands[p, 2] <= trunk <= bands[p, 3]:
+            score += points[p, 1]
+        
+        # Knee drive bonus, on the more bent knee (a NaN side is skipped,
+        # as np.fmin would; 0.0 is a real angle, not a missing one)
+        lk = left_knee[i]
+        rk = right_knee[i]
+        front_knee = rk if (rk < lk or lk != lk) else lk
+        if 90 <= front_knee <= 120:
+            score += 1.0
+        
+        # Unknown phase penalty
+        if p == unknown_idx:
+            score -= 1.0
+        
+        scores[i] = min(10.0, max(0.0, score))
+    
+    return scores, inner_hit
+
+
+def calculate_form_scores_batch(
+    trunk_lean: np.ndarray,
+    left_knee: np.ndarray,
+    right_knee: np.ndarray,
+    phase_idx: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate form scores (0-10) for every frame at once.
+    
+    Args:
+        trunk_lean: Trunk lean per frame in degrees (NaN if missing)
+        left_knee: Left knee angle per frame (NaN if missing)
+        right_knee: Right knee angle per frame (NaN if missing)
+        phase_idx: Phase per frame as a PHASE_INDEX code
+        
+    Returns:
+        (scores, inner_hit) arrays, where inner_hit marks frames whose
+        trunk lean landed in the phase's inner target band.
+    """
+    return _score_kernel(
+        np.ascontiguousarray(trunk_lean, dtype=np.float32),
+        np.ascontiguousarray(left_knee, dtype=np.float32),
+        np.ascontiguousarray(right_knee, dtype=np.float32),
+        np.ascontiguousarray(phase_idx, dtype=np.int8),
+        TRUNK_BANDS,
+        TRUNK_POINTS,
+        PHASE_INDEX[SprintPhase.UNKNOWN],
+    )
+
+
+def rate_form_scores(scores: np.ndarray) -> np.ndarray:
+    """Rate form scores as "poor", "okay" or "good" with one lookup."""
+    return SCORE_RATINGS[np.searchsorted(SCORE_RATING_BREAKS, scores, side="right")]
@@ -2,14 +2,22 @@
 
 from .video import (
     load_video_from_uploaded_file,
+    load_video_source,
     load_image_from_uploaded_file,
     get_video_properties,
     sample_frames,
+    prefetch,
+    encode_frame_jpeg,
+    decode_frame_jpeg,
 )
 
 __all__ = [
     "load_video_from_uploaded_file",
+    "load_video_source",
     "load_image_from_uploaded_file", 
     "get_video_properties",
     "sample_frames",
+    "prefetch",
+    "encode_frame_jpeg",
+    "decode_frame_jpeg",
 ]
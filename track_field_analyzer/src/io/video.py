@@ -1,25 +1,59 @@
 """Video and image loading utilities.
 
-Handles Streamlit uploaded files by writing to temp files,
-then reading via OpenCV. Includes frame sampling for performance.
+Handles Streamlit uploaded files, decoding them from memory with PyAV
+when installed or via a temp file read by OpenCV otherwise. Includes
+frame sampling for performance.
 """
 
 from __future__ import annotations
 
+import io
+import queue
+import shutil
 import tempfile
+import threading
 from pathlib import Path
-from typing import Generator, Any
+from typing import Generator, Any, Iterable, TypeVar
 
 import cv2
 import numpy as np
 
+# PyAV is optional: it decodes with FFmpeg's frame threading and converts
+# to RGB in the decoder. Without it, sampling uses OpenCV.
+try:
+    import av
+    PYAV_AVAILABLE = True
+except ImportError:
+    PYAV_AVAILABLE = False
+
+T = TypeVar("T")
+
+# RAM-backed filesystem (Linux) for upload temp files, when it has room
+_SHM_DIR = "/dev/shm"
+
+
+def _temp_dir_for(size: int) -> str | None:
+    """Directory for a temp file of size bytes; None means the default.
+    
+    /dev/shm is used when it has room for the file with headroom to spare,
+    since containers often mount it with only 64 MB.
+    """
+    try:
+        if shutil.disk_usage(_SHM_DIR).free > 2 * size:
+            return _SHM_DIR
+    except OSError:
+        pass
+    return None
+
 
 def load_video_from_uploaded_file(uploaded_file: Any) -> str:
     """
     Write Streamlit uploaded video file to a temporary location.
     
     Streamlit's UploadedFile object doesn't have a filesystem path,
-    so we must write it to a temp file for OpenCV to read.
+    so we must write it to a temp file for OpenCV to read. On Linux the
+    file goes to tmpfs (/dev/shm) when there is room, so it never
+    touches the disk.
     
     Args:
         uploaded_file: Streamlit UploadedFile object
@@ -32,30 +66,76 @@ def load_video_from_uploaded_file(uploaded_file: Any) -> str:
     """
     # Get file extension from original filename
     suffix = Path(uploaded_file.name).suffix.lower()
+    data = uploaded_file.getbuffer()  # View of the upload, not a copy
     
     # Create temp file with correct extension
     temp_file = tempfile.NamedTemporaryFile(
         delete=False,
-        suffix=suffix
+        suffix=suffix,
+        dir=_temp_dir_for(data.nbytes),
     )
     
+    temp_path = temp_file.name
     try:
         # Write uploaded content to temp file
-        temp_file.write(uploaded_file.getbuffer())
+        temp_file.write(data)
         temp_file.flush()
-        temp_path = temp_file.name
-    finally:
+    except OSError as e:
         temp_file.close()
+        cleanup_temp_file(temp_path)
+        raise ValueError(f"Could not write video file: {uploaded_file.name}") from e
+    temp_file.close()
     
     # Verify the file can be opened by OpenCV
     cap = cv2.VideoCapture(temp_path)
     if not cap.isOpened():
+        cleanup_temp_file(temp_path)
         raise ValueError(f"Could not open video file: {uploaded_file.name}")
     cap.release()
     
     return temp_path
 
 
+def load_video_source(uploaded_file: Any) -> str | bytes:
+    """
+    Get a source for get_video_properties and sample_frames from an upload.
+    
+    With PyAV the upload's bytes are decoded directly from memory, so no
+    copy is written to disk. Without it, OpenCV needs a file path and
+    the upload is written to a temp file.
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile object
+        
+    Returns:
+        The file contents as bytes, or a temp file path (str) which the
+        caller should remove with cleanup_temp_file
+        
+    Raises:
+        ValueError: If the temp file cannot be written or opened
+    """
+    if PYAV_AVAILABLE:
+        return uploaded_file.getvalue()
+    return load_video_from_uploaded_file(uploaded_file)
+
+
+def _open_pyav(video_source: str | bytes) -> Any:
+    """Open a path or in-memory video with PyAV, raising ValueError on failure."""
+    name = video_source if isinstance(video_source, str) else "<in-memory video>"
+    file = io.BytesIO(video_source) if isinstance(video_source, bytes) else video_source
+    
+    try:
+        container = av.open(file)
+    except av.FFmpegError:
+        raise ValueError(f"Could not open video: {name}")
+    
+    if not container.streams.video:
+        container.close()
+        raise ValueError(f"Could not open video: {name}")
+    
+    return container
+
+
 def load_image_from_uploaded_file(uploaded_file: Any) -> np.ndarray:
     """
     Load an image from Streamlit uploaded file.
@@ -84,12 +164,13 @@ def load_image_from_uploaded_file(uploaded_file: Any) -> np.ndarray:
     return image_rgb
 
 
-def get_video_properties(video_path: str) -> dict:
+def get_video_properties(video_path: str | bytes) -> dict:
     """
     Get video metadata properties.
     
     Args:
-        video_path: Path to video file
+        video_path: Path to video file, or its contents as bytes
+                    (requires PyAV)
         
     Returns:
         dict with keys:
@@ -102,6 +183,9 @@ def get_video_properties(video_path: str) -> dict:
     Raises:
         ValueError: If video cannot be opened
     """
+    if isinstance(video_path, bytes):
+        return _video_properties_pyav(video_path)
+    
     cap = cv2.VideoCapture(video_path)
     
     if not cap.isOpened():
@@ -127,20 +211,65 @@ def get_video_properties(video_path: str) -> dict:
         cap.release()
 
 
+def _video_properties_pyav(data: bytes) -> dict:
+    """get_video_properties for an in-memory video."""
+    if not PYAV_AVAILABLE:
+        raise ValueError("Reading video from memory requires PyAV")
+    
+    container = _open_pyav(data)
+    
+    try:
+        stream = container.streams.video[0]
+        rate = stream.average_rate or stream.guessed_rate
+        fps = float(rate) if rate else 0.0
+        
+        # Not every container stores a frame count; estimate from duration
+        frame_count = stream.frames
+        if not frame_count and stream.duration is not None and stream.time_base:
+            frame_count = round(float(stream.duration * stream.time_base) * fps)
+        elif not frame_count and container.duration is not None:
+            frame_count = round(container.duration / av.time_base * fps)
+        
+        duration_sec = frame_count / fps if fps > 0 else 0.0
+        
+        return {
+            "fps": fps,
+            "frame_count": int(frame_count),
+            "width": stream.codec_context.width,
+            "height": stream.codec_context.height,
+            "duration_sec": duration_sec,
+        }
+    finally:
+        container.close()
+
+
+def _fit_width(width: int, height: int, max_width: int | None) -> tuple[int, int] | None:
+    """(width, height) to downscale to so width <= max_width, or None if it fits."""
+    if max_width is None or width <= max_width:
+        return None
+    return (max_width, max(1, round(height * max_width / width)))
+
+
 def sample_frames(
-    video_path: str,
+    video_path: str | bytes,
     sample_rate: int = 5,
-    max_frames: int | None = None
+    max_frames: int | None = None,
+    max_width: int | None = None,
 ) -> Generator[tuple[int, np.ndarray], None, None]:
     """
     Generator that yields sampled frames from a video.
     
-    Memory-efficient: only one frame loaded at a time.
+    Memory-efficient: only one frame loaded at a time. Decodes with
+    PyAV (multi-threaded) when installed, otherwise with OpenCV.
     
     Args:
-        video_path: Path to video file
+        video_path: Path to video file, or its contents as bytes
+                    (requires PyAV)
         sample_rate: Process every Nth frame (1 = all frames)
         max_frames: Optional maximum number of frames to yield
+        max_width: If set, wider frames are downscaled to this width
+                   (aspect ratio preserved) as part of the colour
+                   conversion, before any full-size RGB copy is made
         
     Yields:
         tuple: (frame_index, frame_rgb as np.ndarray)
@@ -148,25 +277,64 @@ def sample_frames(
     Raises:
         ValueError: If video cannot be opened
     """
+    if PYAV_AVAILABLE:
+        return _sample_frames_pyav(video_path, sample_rate, max_frames, max_width)
+    if isinstance(video_path, bytes):
+        raise ValueError("Reading video from memory requires PyAV")
+    return _sample_frames_opencv(video_path, sample_rate, max_frames, max_width)
+
+
+def _sample_frames_opencv(
+    video_path: str,
+    sample_rate: int,
+    max_frames: int | None,
+    max_width: int | None = None,
+) -> Generator[tuple[int, np.ndarray], None, None]:
+    """sample_frames backend using cv2.VideoCapture.
+    
+    Skipped frames are grabbed but not retrieved, so they skip colour
+    conversion and the copy out of the decoder. Kept frames are resized
+    before the BGR to RGB conversion so it runs on the smaller image.
+    """
     cap = cv2.VideoCapture(video_path)
     
     if not cap.isOpened():
         raise ValueError(f"Could not open video: {video_path}")
     
+    return _iter_opencv(cap, sample_rate, max_frames, max_width)
+
+
+def _iter_opencv(
+    cap: cv2.VideoCapture,
+    sample_rate: int,
+    max_frames: int | None,
+    max_width: int | None,
+) -> Generator[tuple[int, np.ndarray], None, None]:
     try:
         frame_index = 0
         yielded_count = 0
+        frame_bgr = None  # Reused decode buffer; yielded RGB frames are fresh
         
         while True:
-            ret, frame_bgr = cap.read()
-            
-            if not ret:
+            # grab() advances without decoding to an image; only frames
+            # we keep pay for retrieve()
+            if not cap.grab():
                 break
             
             # Check if we should yield this frame
             if frame_index % sample_rate == 0:
+                ret, frame_bgr = cap.retrieve(frame_bgr)
+                if not ret:
+                    break
+                
+                size = _fit_width(frame_bgr.shape[1], frame_bgr.shape[0], max_width)
+                frame_small = (
+                    frame_bgr if size is None
+                    else cv2.resize(frame_bgr, size, interpolation=cv2.INTER_AREA)
+                )
+                
                 # Convert BGR to RGB
-                frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+                frame_rgb = cv2.cvtColor(frame_small, cv2.COLOR_BGR2RGB)
                 yield (frame_index, frame_rgb)
                 yielded_count += 1
                 
@@ -179,6 +347,199 @@ def sample_frames(
         cap.release()
 
 
+def _sample_frames_pyav(
+    video_path: str | bytes,
+    sample_rate: int,
+    max_frames: int | None,
+    max_width: int | None = None,
+) -> Generator[tuple[int, np.ndarray], None, None]:
+    """sample_frames backend using PyAV with threaded decoding.
+    
+    Sampling strides (2-10 frames) are far shorter than a typical GOP,
+    so every frame is decoded in order rather than seeking per index.
+    Scaling and conversion to RGB happen in one swscale pass straight
+    from the decoder's YUV planes. Videos with rotation metadata are
+    handed to OpenCV, which applies the rotation automatically.
+    
+    No hardware decoder is requested: every frame, sampled or not,
+    would be copied back from the GPU for the skip/keep test, and
+    support varies from machine to machine.
+    """
+    container = _open_pyav(video_path)
+    stream = container.streams.video[0]
+    stream.thread_type = "AUTO"
+    return _iter_pyav(container, stream, video_path, sample_rate, max_frames, max_width)
+
+
+def _iter_pyav(
+    container: Any,
+    stream: Any,
+    video_path: str | bytes,
+    sample_rate: int,
+    max_frames: int | None,
+    max_width: int | None,
+) -> Generator[tuple[int, np.ndarray], None, None]:
+    rotated = False
+    
+    try:
+        yielded_count = 0
+        size = None
+        
+        for frame_index, frame in enumerate(container.decode(stream)):
+            # VideoFrame.rotation is missing from older PyAV releases
+            # (12.x); treat those as unrotated rather than failing
+            if frame_index == 0 and getattr(frame, "rotation", 0):
+                rotated = True
+                break
+            
+            if frame_index == 0:
+                size = _fit_width(frame.width, frame.height, max_width)
+            
+            if frame_index % sample_rate == 0:
+                if size is None:
+                    frame_rgb = frame.to_ndarray(format="rgb24")
+                else:
+                    frame_rgb = frame.reformat(
+                        size[0], size[1], "rgb24", interpolation="AREA"
+                    ).to_ndarray()
+                yield (frame_index, frame_rgb)
+                yielded_count += 1
+                
+                # Check max frames limit
+                if max_frames is not None and yielded_count >= max_frames:
+                    break
+    finally:
+        container.close()
+    
+    if rotated:
+        if isinstance(video_path, str):
+            yield from _sample_frames_opencv(video_path, sample_rate, max_frames, max_width)
+            return
+        
+        # OpenCV only reads from disk
+        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+            temp_file.write(video_path)
+        try:
+            yield from _sample_frames_opencv(temp_file.name, sample_rate, max_frames, max_width)
+        finally:
+            cleanup_temp_file(temp_file.name)
+
+
+def prefetch(items: Iterable[T], maxsize: int = 8) -> Generator[T, None, None]:
+    """
+    Produce items on a background thread, buffered in a bounded queue.
+    
+    Wrapping sample_frames lets decoding run ahead while the caller
+    works on earlier frames; the bound keeps memory flat. Exceptions
+    from the producer are re-raised in the consumer. Closing the
+    returned generator stops the producer and closes the source.
+    
+    Args:
+        items: Iterable to consume on the background thread
+        maxsize: Maximum number of items buffered ahead
+        
+    Yields:
+        Items from the source, in order
+    """
+    buffer: queue.Queue = queue.Queue(maxsize)
+    stop = threading.Event()
+    done = object()
+    
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+            put(done)
+        except BaseException as e:
+            put(e)
+        finally:
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+    
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+def encode_frame_jpeg(
+    frame_rgb: np.ndarray,
+    quality: int = 85,
+    max_width: int | None = None,
+) -> bytes:
+    """
+    Encode an RGB frame as JPEG bytes.
+    
+    Encoded frames are ~10x smaller than raw RGB and can be passed
+    straight to st.image without re-encoding on every rerun.
+    
+    Args:
+        frame_rgb: RGB image as numpy array (H, W, 3)
+        quality: JPEG quality [0, 100]
+        max_width: If set, downscale wider frames to this width first
+                   (aspect ratio preserved)
+        
+    Returns:
+        bytes: JPEG-encoded image
+        
+    Raises:
+        ValueError: If the frame cannot be encoded
+    """
+    size = _fit_width(frame_rgb.shape[1], frame_rgb.shape[0], max_width)
+    if size is not None:
+        frame_rgb = cv2.resize(frame_rgb, size, interpolation=cv2.INTER_AREA)
+    
+    frame_bgr = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
+    ok, buffer = cv2.imencode(".jpg", frame_bgr, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    
+    if not ok:
+        raise ValueError("Could not encode frame as JPEG")
+    
+    return buffer.tobytes()
+
+
+def decode_frame_jpeg(data: bytes) -> np.ndarray:
+    """
+    Decode JPEG bytes from encode_frame_jpeg back to an RGB frame.
+    
+    Args:
+        data: JPEG-encoded image
+        
+    Returns:
+        RGB image as numpy array (H, W, 3)
+        
+    Raises:
+        ValueError: If the data cannot be decoded
+    """
+    frame_bgr = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    
+    if frame_bgr is None:
+        raise ValueError("Could not decode JPEG frame")
+    
+    return cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+
+
 def cleanup_temp_file(temp_path: str) -> None:
     """
     Clean up a temporary file.
@@ -1,5 +1,5 @@
 """Pose estimation module."""
 
-from .mediapipe_pose import PoseEstimator, PoseResult, Landmark
+from .mediapipe_pose import PoseEstimator, PoseResult, Landmark, estimate_poses_parallel
 
-__all__ = ["PoseEstimator", "PoseResult", "Landmark"]
+__all__ = ["PoseEstimator", "PoseResult", "Landmark", "estimate_poses_parallel"]
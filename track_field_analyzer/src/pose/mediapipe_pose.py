@@ -8,34 +8,55 @@ Supports both legacy (mp.solutions.pose) and new (mediapipe-model-maker) APIs.
 
 from __future__ import annotations
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Sequence
 
+import cv2
 import numpy as np
 
-# Try to import MediaPipe with fallback for different versions
-try:
-    import mediapipe as mp
-    # Check if solutions API is available (older versions)
-    if hasattr(mp, 'solutions'):
-        from mediapipe.python.solutions import pose as mp_pose
-        MEDIAPIPE_LEGACY = True
-    else:
-        # Newer versions use tasks API
-        MEDIAPIPE_LEGACY = False
-        try:
-            from mediapipe.tasks import python as mp_tasks
-            from mediapipe.tasks.python import vision
-            from mediapipe import Image, ImageFormat
-        except ImportError:
-            raise ImportError(
-                "MediaPipe tasks API not found. Please install with: "
-                "pip install mediapipe>=0.10.0"
-            )
-except ImportError:
-    raise ImportError(
-        "MediaPipe is required. Install with: pip install mediapipe"
-    )
+# MediaPipe takes a noticeable time to import, so it is loaded on first
+# estimator construction rather than at module import. Landmark types
+# and indices below are usable without it.
+MEDIAPIPE_LEGACY: bool | None = None
+
+
+def _import_mediapipe() -> bool:
+    """Import MediaPipe once, with fallback for different versions.
+    
+    Returns:
+        True if the legacy solutions API is available
+    """
+    global MEDIAPIPE_LEGACY, mp_pose, mp_tasks, vision, Image, ImageFormat
+    
+    if MEDIAPIPE_LEGACY is not None:
+        return MEDIAPIPE_LEGACY
+    
+    try:
+        import mediapipe as mp
+        # Check if solutions API is available (older versions)
+        if hasattr(mp, 'solutions'):
+            from mediapipe.python.solutions import pose as mp_pose
+            MEDIAPIPE_LEGACY = True
+        else:
+            # Newer versions use tasks API
+            try:
+                from mediapipe.tasks import python as mp_tasks
+                from mediapipe.tasks.python import vision
+                from mediapipe import Image, ImageFormat
+            except ImportError:
+                raise ImportError(
+                    "MediaPipe tasks API not found. Please install with: "
+                    "pip install mediapipe>=0.10.0"
+                )
+            MEDIAPIPE_LEGACY = False
+    except ImportError:
+        raise ImportError(
+            "MediaPipe is required. Install with: pip install mediapipe"
+        )
+    
+    return MEDIAPIPE_LEGACY
 
 
 # MediaPipe BlazePose landmark indices
@@ -165,8 +186,9 @@ class PoseEstimatorLegacy:
         enable_segmentation: bool = False,
         min_detection_confidence: float = 0.5,
         min_tracking_confidence: float = 0.5,
+        use_gpu: bool = False,  # The legacy Python solution is CPU-only
     ):
-        self._pose = mp_pose.Pose(
+        self._pose_kwargs = dict(
             static_image_mode=static_image_mode,
             model_complexity=model_complexity,
             smooth_landmarks=smooth_landmarks,
@@ -174,13 +196,22 @@ class PoseEstimatorLegacy:
             min_detection_confidence=min_detection_confidence,
             min_tracking_confidence=min_tracking_confidence,
         )
+        self._pose = mp_pose.Pose(**self._pose_kwargs)
+        self._static_mode = static_image_mode
+        self._tracked = False  # Tracking state built up since the last reset
         self._is_closed = False
     
     def process_frame(self, frame_rgb: np.ndarray) -> PoseResult | None:
         if self._is_closed:
             raise RuntimeError("PoseEstimator has been closed")
         
-        results = self._pose.process(frame_rgb)
+        # The legacy graph wraps read-only arrays without copying them. A
+        # read-only view leaves the caller's array (possibly the reused
+        # downscale buffer) writable.
+        frame_view = frame_rgb.view()
+        frame_view.flags.writeable = False
+        results = self._pose.process(frame_view)
+        self._tracked = not self._static_mode
         
         if results.pose_landmarks is None:
             return None
@@ -212,6 +243,13 @@ class PoseEstimatorLegacy:
             world_landmarks=world_landmarks,
         )
     
+    def reset(self) -> None:
+        """Drop the tracked pose; the graph is rebuilt only if it tracked."""
+        if self._tracked and not self._is_closed:
+            self._pose.close()
+            self._pose = mp_pose.Pose(**self._pose_kwargs)
+        self._tracked = False
+    
     def close(self) -> None:
         if not self._is_closed:
             self._pose.close()
@@ -221,6 +259,9 @@ class PoseEstimatorLegacy:
 class PoseEstimatorTasks:
     """New API wrapper using mediapipe.tasks (MediaPipe >= 0.10.14)."""
     
+    # Timestamp jump between clips in video mode, in ms
+    CLIP_GAP_MS = 10_000
+    
     def __init__(
         self,
         static_image_mode: bool = False,
@@ -229,6 +270,7 @@ class PoseEstimatorTasks:
         enable_segmentation: bool = False,
         min_detection_confidence: float = 0.5,
         min_tracking_confidence: float = 0.5,
+        use_gpu: bool = False,
     ):
         # Download model if needed
         import urllib.request
@@ -248,22 +290,36 @@ class PoseEstimatorTasks:
             urllib.request.urlretrieve(model_url, model_path)
         
         # Set up the pose landmarker
-        base_options = mp_tasks.BaseOptions(model_asset_path=model_path)
-        
         if static_image_mode:
             running_mode = vision.RunningMode.IMAGE
         else:
             running_mode = vision.RunningMode.VIDEO
         
-        options = vision.PoseLandmarkerOptions(
-            base_options=base_options,
-            running_mode=running_mode,
-            min_pose_detection_confidence=min_detection_confidence,
-            min_tracking_confidence=min_tracking_confidence,
-            output_segmentation_masks=enable_segmentation,
-        )
+        def make_options(delegate):
+            return vision.PoseLandmarkerOptions(
+                base_options=mp_tasks.BaseOptions(
+                    model_asset_path=model_path, delegate=delegate,
+                ),
+                running_mode=running_mode,
+                min_pose_detection_confidence=min_detection_confidence,
+                min_tracking_confidence=min_tracking_confidence,
+                output_segmentation_masks=enable_segmentation,
+            )
         
-        self._detector = vision.PoseLandmarker.create_from_options(options)
+        delegate = mp_tasks.BaseOptions.Delegate
+        if use_gpu:
+            # The GPU delegate needs an OpenGL ES / Metal context, which
+            # Windows and headless hosts lack; run on the CPU there instead
+            try:
+                self._detector = vision.PoseLandmarker.create_from_options(
+                    make_options(delegate.GPU)
+                )
+            except (RuntimeError, NotImplementedError):
+                use_gpu = False
+        if not use_gpu:
+            self._detector = vision.PoseLandmarker.create_from_options(
+                make_options(delegate.CPU)
+            )
         self._static_mode = static_image_mode
         self._frame_timestamp = 0
         self._is_closed = False
@@ -314,6 +370,16 @@ class PoseEstimatorTasks:
             world_landmarks=world_landmarks,
         )
     
+    def reset(self) -> None:
+        """Restart the frame clock for a new clip.
+        
+        The video-mode landmarker requires increasing timestamps for its
+        whole lifetime, so instead of going back to zero the clock jumps
+        ahead by CLIP_GAP_MS, far beyond any frame interval.
+        """
+        if not self._static_mode:
+            self._frame_timestamp += self.CLIP_GAP_MS
+    
     def close(self) -> None:
         if not self._is_closed:
             self._detector.close()
@@ -338,6 +404,9 @@ class PoseEstimator:
             result = estimator.process_frame(frame_rgb)
     """
     
+    # Consecutive tracking-mode misses before falling back to detection
+    TRACKING_MISS_LIMIT = 2
+    
     def __init__(
         self,
         static_image_mode: bool = False,
@@ -346,6 +415,8 @@ class PoseEstimator:
         enable_segmentation: bool = False,
         min_detection_confidence: float = 0.5,
         min_tracking_confidence: float = 0.5,
+        max_input_size: int | None = None,
+        use_gpu: bool = False,
     ):
         """
         Initialize MediaPipe Pose model.
@@ -358,25 +429,31 @@ class PoseEstimator:
             enable_segmentation: Enable body segmentation mask
             min_detection_confidence: Minimum confidence for person detection
             min_tracking_confidence: Minimum confidence for landmark tracking
+            max_input_size: If set, frames whose longer side exceeds this are
+                            downscaled before inference. Landmarks are
+                            normalized, so results need no rescaling.
+            use_gpu: Run inference on the GPU delegate where available
+                     (Tasks API only; falls back to the CPU otherwise)
+            
+        In tracking mode, after TRACKING_MISS_LIMIT consecutive frames
+        without a pose, frames are run through a static-image detector
+        until a pose is found again.
         """
-        if MEDIAPIPE_LEGACY:
-            self._impl = PoseEstimatorLegacy(
-                static_image_mode=static_image_mode,
-                model_complexity=model_complexity,
-                smooth_landmarks=smooth_landmarks,
-                enable_segmentation=enable_segmentation,
-                min_detection_confidence=min_detection_confidence,
-                min_tracking_confidence=min_tracking_confidence,
-            )
-        else:
-            self._impl = PoseEstimatorTasks(
-                static_image_mode=static_image_mode,
-                model_complexity=model_complexity,
-                smooth_landmarks=smooth_landmarks,
-                enable_segmentation=enable_segmentation,
-                min_detection_confidence=min_detection_confidence,
-                min_tracking_confidence=min_tracking_confidence,
-            )
+        self._impl_cls = PoseEstimatorLegacy if _import_mediapipe() else PoseEstimatorTasks
+        self._impl_kwargs = dict(
+            model_complexity=model_complexity,
+            smooth_landmarks=smooth_landmarks,
+            enable_segmentation=enable_segmentation,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            use_gpu=use_gpu,
+        )
+        self._impl = self._impl_cls(static_image_mode=static_image_mode, **self._impl_kwargs)
+        self._static_mode = static_image_mode
+        self._max_input_size = max_input_size
+        self._input_buf: np.ndarray | None = None  # Reused downscale target
+        self._static_impl = None  # Lazily created re-detection fallback
+        self._miss_streak = 0
     
     def process_frame(self, frame_rgb: np.ndarray) -> PoseResult | None:
         """
@@ -388,11 +465,54 @@ class PoseEstimator:
         Returns:
             PoseResult with landmarks, or None if no pose detected
         """
-        return self._impl.process_frame(frame_rgb)
+        # The model runs at low resolution internally; shrinking first
+        # saves the full-size image copy and conversion. Frames of a video
+        # share one size, so the downscaled image is written into the same
+        # buffer each call (MediaPipe copies it and keeps no reference).
+        if self._max_input_size is not None:
+            height, width = frame_rgb.shape[:2]
+            scale = self._max_input_size / max(height, width)
+            if scale < 1:
+                size = (round(width * scale), round(height * scale))
+                buf = self._input_buf
+                if buf is None or buf.shape[:2] != (size[1], size[0]):
+                    buf = self._input_buf = np.empty((size[1], size[0], 3), dtype=np.uint8)
+                frame_rgb = cv2.resize(frame_rgb, size, dst=buf, interpolation=cv2.INTER_AREA)
+        
+        # In tracking mode, fall back to full per-frame detection after
+        # repeated misses (e.g. a sample interval too wide to track across)
+        if not self._static_mode and self._miss_streak >= self.TRACKING_MISS_LIMIT:
+            if self._static_impl is None:
+                self._static_impl = self._impl_cls(static_image_mode=True, **self._impl_kwargs)
+            result = self._static_impl.process_frame(frame_rgb)
+        else:
+            result = self._impl.process_frame(frame_rgb)
+        
+        self._miss_streak = 0 if result is not None else self._miss_streak + 1
+        return result
+    
+    def reset(self) -> None:
+        """Forget per-clip state so the next frame starts a new clip.
+        
+        The loaded models are kept: the backends only restart their
+        frame clock or, for a legacy graph that tracked a pose, rebuild
+        that graph. The re-detection fallback starts over as well.
+        """
+        self._miss_streak = 0
+        self._impl.reset()
+        if self._static_impl is not None:
+            self._static_impl.reset()
+    
+    @property
+    def static_image_mode(self) -> bool:
+        """True if every frame is detected independently (no tracking)."""
+        return self._static_mode
     
     def close(self) -> None:
         """Release MediaPipe resources."""
         self._impl.close()
+        if self._static_impl is not None:
+            self._static_impl.close()
     
     def __enter__(self) -> "PoseEstimator":
         """Context manager entry."""
@@ -401,3 +521,59 @@ class PoseEstimator:
     def __exit__(self, *args: Any) -> None:
         """Context manager exit."""
         self.close()
+
+
+def estimate_poses_parallel(
+    frames: Sequence[np.ndarray],
+    estimators: Sequence[PoseEstimator],
+) -> list[PoseResult | None]:
+    """
+    Run pose estimation on frames using one thread per estimator.
+    
+    When every estimator is in static image mode frames are independent,
+    so idle workers take the next unprocessed frame, which keeps all
+    workers busy until the end. Otherwise every frame goes through the
+    first estimator alone: a clip arrives in several calls (windows), and
+    splitting each call between trackers would make every tracker jump
+    over the other trackers' frames at each window boundary.
+    
+    Args:
+        frames: RGB frames in video order
+        estimators: Independent PoseEstimator instances (not shared
+                    with other threads while this runs); only the first
+                    is used unless all are in static image mode
+        
+    Returns:
+        One PoseResult (or None) per frame, in input order
+    """
+    n_workers = max(1, min(len(estimators), len(frames)))
+    
+    if n_workers > 1 and all(
+        getattr(e, "static_image_mode", False) for e in estimators[:n_workers]
+    ):
+        return _estimate_poses_shared(frames, estimators[:n_workers])
+    
+    estimator = estimators[0]
+    return [estimator.process_frame(f) for f in frames]
+
+
+def _estimate_poses_shared(
+    frames: Sequence[np.ndarray],
+    estimators: Sequence[PoseEstimator],
+) -> list[PoseResult | None]:
+    """estimate_poses_parallel for static estimators: workers pull frames from a shared counter."""
+    results: list[PoseResult | None] = [None] * len(frames)
+    pending = iter(range(len(frames)))
+    lock = threading.Lock()
+    
+    def work(estimator: PoseEstimator) -> None:
+        while True:
+            with lock:
+                i = next(pending, None)
+            if i is None:
+                return
+            results[i] = estimator.process_frame(frames[i])
+    
+    with ThreadPoolExecutor(max_workers=len(estimators)) as executor:
+        list(executor.map(work, estimators))
+    return results
@@ -1,6 +1,11 @@
 """Visualization functions for skeleton and annotation overlay.
 
 Draws pose skeleton, angle annotations, and phase labels on video frames.
+Each primitive only touches the pixels it covers (tens of microseconds
+on a 1080p frame), so drawing stays on plain NumPy arrays; moving a
+frame to an OpenCL UMat and back would cost more than the drawing.
+Labels use OpenCV's Hershey stroke fonts (no font shaping), at about
+0.1 ms per label.
 """
 
 from __future__ import annotations
@@ -17,6 +22,28 @@ if TYPE_CHECKING:
 
 from ..pose.mediapipe_pose import POSE_CONNECTIONS, LandmarkIndex
 
+_FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+# Key joints drawn in their own colors instead of landmark_color
+_JOINT_COLORS = {
+    LandmarkIndex.LEFT_HIP: (255, 165, 0),  # Orange for hips
+    LandmarkIndex.RIGHT_HIP: (255, 165, 0),
+    LandmarkIndex.LEFT_KNEE: (0, 255, 255),  # Cyan for knees
+    LandmarkIndex.RIGHT_KNEE: (0, 255, 255),
+    LandmarkIndex.LEFT_SHOULDER: (255, 0, 255),  # Magenta for shoulders
+    LandmarkIndex.RIGHT_SHOULDER: (255, 0, 255),
+}
+
+# Map angle names to landmark indices for positioning
+_ANGLE_POSITIONS = {
+    "left_knee": LandmarkIndex.LEFT_KNEE,
+    "right_knee": LandmarkIndex.RIGHT_KNEE,
+    "left_hip": LandmarkIndex.LEFT_HIP,
+    "right_hip": LandmarkIndex.RIGHT_HIP,
+    "left_elbow": LandmarkIndex.LEFT_ELBOW,
+    "right_elbow": LandmarkIndex.RIGHT_ELBOW,
+}
+
 
 def draw_skeleton(
     frame: np.ndarray,
@@ -44,39 +71,43 @@ def draw_skeleton(
     """
     # Make a copy to avoid modifying original
     annotated = frame.copy()
-    height, width = annotated.shape[:2]
+    _draw_skeleton(
+        annotated, landmarks, visibility_threshold,
+        connection_color, landmark_color, thickness, circle_radius,
+    )
+    return annotated
+
+
+def _draw_skeleton(
+    img: np.ndarray,
+    landmarks: list["Landmark"],
+    visibility_threshold: float = 0.5,
+    connection_color: tuple[int, int, int] = (0, 255, 0),
+    landmark_color: tuple[int, int, int] = (255, 0, 0),
+    thickness: int = 2,
+    circle_radius: int = 5,
+) -> None:
+    """Draw the pose skeleton onto img in place (see draw_skeleton)."""
+    height, width = img.shape[:2]
+    
+    # Pixel position of each visible landmark, None if hidden
+    points = [
+        lm.to_pixel(width, height) if lm.visibility >= visibility_threshold else None
+        for lm in landmarks
+    ]
     
     # Draw connections first (so joints overlay them)
     for start_idx, end_idx in POSE_CONNECTIONS:
-        start_lm = landmarks[start_idx]
-        end_lm = landmarks[end_idx]
-        
-        # Check visibility
-        if (start_lm.visibility >= visibility_threshold and
-            end_lm.visibility >= visibility_threshold):
-            
-            start_pt = start_lm.to_pixel(width, height)
-            end_pt = end_lm.to_pixel(width, height)
-            
-            cv2.line(annotated, start_pt, end_pt, connection_color, thickness)
+        start_pt = points[start_idx]
+        end_pt = points[end_idx]
+        if start_pt is not None and end_pt is not None:
+            cv2.line(img, start_pt, end_pt, connection_color, thickness)
     
     # Draw landmarks
-    for i, lm in enumerate(landmarks):
-        if lm.visibility >= visibility_threshold:
-            pt = lm.to_pixel(width, height)
-            
-            # Use different colors for key joints
-            color = landmark_color
-            if i in [LandmarkIndex.LEFT_HIP, LandmarkIndex.RIGHT_HIP]:
-                color = (255, 165, 0)  # Orange for hips
-            elif i in [LandmarkIndex.LEFT_KNEE, LandmarkIndex.RIGHT_KNEE]:
-                color = (0, 255, 255)  # Cyan for knees
-            elif i in [LandmarkIndex.LEFT_SHOULDER, LandmarkIndex.RIGHT_SHOULDER]:
-                color = (255, 0, 255)  # Magenta for shoulders
-            
-            cv2.circle(annotated, pt, circle_radius, color, -1)
-    
-    return annotated
+    for i, pt in enumerate(points):
+        if pt is not None:
+            color = _JOINT_COLORS.get(i, landmark_color)
+            cv2.circle(img, pt, circle_radius, color, -1)
 
 
 def draw_angle_annotations(
@@ -104,25 +135,32 @@ def draw_angle_annotations(
         Frame with angle annotations
     """
     annotated = frame.copy()
-    height, width = annotated.shape[:2]
-    font = cv2.FONT_HERSHEY_SIMPLEX
-    
-    # Map angle names to landmark indices for positioning
-    angle_positions = {
-        "left_knee": LandmarkIndex.LEFT_KNEE,
-        "right_knee": LandmarkIndex.RIGHT_KNEE,
-        "left_hip": LandmarkIndex.LEFT_HIP,
-        "right_hip": LandmarkIndex.RIGHT_HIP,
-        "left_elbow": LandmarkIndex.LEFT_ELBOW,
-        "right_elbow": LandmarkIndex.RIGHT_ELBOW,
-    }
+    _draw_angle_annotations(
+        annotated, landmarks, angles, visibility_threshold,
+        font_scale, font_color, bg_color,
+    )
+    return annotated
+
+
+def _draw_angle_annotations(
+    img: np.ndarray,
+    landmarks: list["Landmark"],
+    angles: dict[str, float],
+    visibility_threshold: float = 0.5,
+    font_scale: float = 0.6,
+    font_color: tuple[int, int, int] = (255, 255, 255),
+    bg_color: tuple[int, int, int] = (0, 0, 0),
+) -> None:
+    """Draw angle values onto img in place (see draw_angle_annotations)."""
+    height, width = img.shape[:2]
+    font = _FONT
     
     for angle_name, value in angles.items():
         if math.isnan(value):
             continue
             
-        if angle_name in angle_positions:
-            idx = angle_positions[angle_name]
+        if angle_name in _ANGLE_POSITIONS:
+            idx = _ANGLE_POSITIONS[angle_name]
             lm = landmarks[idx]
             
             if lm.visibility >= visibility_threshold:
@@ -135,7 +173,7 @@ def draw_angle_annotations(
                 # Draw background rectangle
                 (text_w, text_h), _ = cv2.getTextSize(text, font, font_scale, 1)
                 cv2.rectangle(
-                    annotated,
+                    img,
                     (text_pt[0] - 2, text_pt[1] - text_h - 2),
                     (text_pt[0] + text_w + 2, text_pt[1] + 2),
                     bg_color,
@@ -144,7 +182,7 @@ def draw_angle_annotations(
                 
                 # Draw text
                 cv2.putText(
-                    annotated, text, text_pt, font,
+                    img, text, text_pt, font,
                     font_scale, font_color, 1, cv2.LINE_AA
                 )
     
@@ -164,18 +202,16 @@ def draw_angle_annotations(
             
             (text_w, text_h), _ = cv2.getTextSize(text, font, font_scale, 1)
             cv2.rectangle(
-                annotated,
+                img,
                 (text_pt[0] - 2, text_pt[1] - text_h - 2),
                 (text_pt[0] + text_w + 2, text_pt[1] + 2),
                 bg_color,
                 -1
             )
             cv2.putText(
-                annotated, text, text_pt, font,
+                img, text, text_pt, font,
                 font_scale, (255, 255, 0), 1, cv2.LINE_AA
             )
-    
-    return annotated
 
 
 def draw_phase_label(
@@ -197,8 +233,19 @@ def draw_phase_label(
         Frame with phase label
     """
     annotated = frame.copy()
-    height, width = annotated.shape[:2]
-    font = cv2.FONT_HERSHEY_SIMPLEX
+    _draw_phase_label(annotated, phase, position, font_scale)
+    return annotated
+
+
+def _draw_phase_label(
+    img: np.ndarray,
+    phase: "SprintPhase",
+    position: str = "top_left",
+    font_scale: float = 1.0,
+) -> None:
+    """Draw the phase label onto img in place (see draw_phase_label)."""
+    height, width = img.shape[:2]
+    font = _FONT
     
     text = f"Phase: {phase.display_name}"
     color = phase.color
@@ -218,7 +265,7 @@ def draw_phase_label(
     
     # Draw background
     cv2.rectangle(
-        annotated,
+        img,
         (pt[0] - 5, pt[1] - text_h - 5),
         (pt[0] + text_w + 5, pt[1] + 5),
         (0, 0, 0),
@@ -226,9 +273,7 @@ def draw_phase_label(
     )
     
     # Draw text
-    cv2.putText(annotated, text, pt, font, font_scale, color, 2, cv2.LINE_AA)
-    
-    return annotated
+    cv2.putText(img, text, pt, font, font_scale, color, 2, cv2.LINE_AA)
 
 
 def draw_frame_info(
@@ -239,8 +284,19 @@ def draw_frame_info(
 ) -> np.ndarray:
     """Draw frame number and timestamp on frame."""
     annotated = frame.copy()
-    height, width = annotated.shape[:2]
-    font = cv2.FONT_HERSHEY_SIMPLEX
+    _draw_frame_info(annotated, frame_index, timestamp, position)
+    return annotated
+
+
+def _draw_frame_info(
+    img: np.ndarray,
+    frame_index: int,
+    timestamp: float,
+    position: str = "top_right",
+) -> None:
+    """Draw frame number and timestamp onto img in place."""
+    height, width = img.shape[:2]
+    font = _FONT
     font_scale = 0.6
     
     text = f"Frame: {frame_index} | {timestamp:.2f}s"
@@ -253,15 +309,13 @@ def draw_frame_info(
         pt = (padding, text_h + padding)
     
     cv2.rectangle(
-        annotated,
+        img,
         (pt[0] - 2, pt[1] - text_h - 2),
         (pt[0] + text_w + 2, pt[1] + 2),
         (0, 0, 0),
         -1
     )
-    cv2.putText(annotated, text, pt, font, font_scale, (200, 200, 200), 1, cv2.LINE_AA)
-    
-    return annotated
+    cv2.putText(img, text, pt, font, font_scale, (200, 200, 200), 1, cv2.LINE_AA)
 
 
 def annotate_frame(
@@ -274,10 +328,13 @@ def annotate_frame(
     draw_angles: bool = True,
     draw_info: bool = True,
     visibility_threshold: float = 0.5,
+    out: np.ndarray | None = None,
 ) -> np.ndarray:
     """
     Full annotation pipeline: skeleton + angles + phase label.
     
+    The frame is copied once and every layer is drawn onto that copy.
+    
     Args:
         frame: RGB image as numpy array
         landmarks: List of Landmark objects
@@ -288,31 +345,35 @@ def annotate_frame(
         draw_angles: Whether to draw angle values
         draw_info: Whether to draw frame info
         visibility_threshold: Min visibility for landmarks
+        out: Optional array of frame's shape and dtype to draw into
+             (may be frame itself to annotate in place); a new copy is
+             allocated if None
         
     Returns:
-        Fully annotated frame
+        Fully annotated frame (out, if given)
     """
+    if out is None:
+        annotated = frame.copy()
+    else:
+        annotated = out
+        if out is not frame:
+            np.copyto(out, frame)
+    
     # Draw skeleton
-    annotated = draw_skeleton(
-        frame, landmarks,
-        visibility_threshold=visibility_threshold
-    )
+    _draw_skeleton(annotated, landmarks, visibility_threshold=visibility_threshold)
     
     # Draw angles if requested
     if draw_angles:
-        annotated = draw_angle_annotations(
+        _draw_angle_annotations(
             annotated, landmarks, angles,
             visibility_threshold=visibility_threshold
         )
     
     # Draw phase label
-    annotated = draw_phase_label(annotated, phase)
+    _draw_phase_label(annotated, phase)
     
     # Draw frame info if requested
     if draw_info:
-        annotated = draw_frame_info(
-            annotated, frame_index, timestamp,
-            position="top_right"
-        )
+        _draw_frame_info(annotated, frame_index, timestamp, position="top_right")
     
     return annotated
@@ -5,14 +5,25 @@ import pytest
 import sys
 from pathlib import Path
 
+import numpy as np
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.analysis.angles import (
+    _TRIPLE_INDEX,
+    _TRUNK_INDEX,
+    _angles_kernel,
+    _angles_numpy,
     calculate_angle,
     calculate_trunk_lean,
+    count_visible_joints,
     extract_joint_angles,
+    extract_joint_angles_batch,
+    get_hip_height_batch,
     get_hip_height_normalized,
+    landmarks_to_array,
+    landmarks_to_array_batch,
 )
 from src.pose.mediapipe_pose import Landmark
 
@@ -84,6 +95,11 @@ class TestCalculateAngle:
         
         angle = calculate_angle(point_a, point_b, point_c)
         assert math.isclose(angle, 90.0, rel_tol=0.01)
+    
+    def test_nan_coordinate_returns_nan(self):
+        """Test that a NaN coordinate gives NaN rather than a clamped angle."""
+        angle = calculate_angle((float("nan"), 0.0), (0.0, 0.0), (1.0, 0.0))
+        assert math.isnan(angle)
 
 
 class TestTrunkLean:
@@ -235,5 +251,87 @@ class TestHipHeight:
         assert math.isnan(height)
 
 
+class TestBatchAngles:
+    """Tests for vectorized angle extraction over frame stacks."""
+    
+    def _random_landmarks(self, rng) -> list[Landmark]:
+        return [
+            Landmark(x=x, y=y, z=z, visibility=v)
+            for x, y, z, v in rng.random((33, 4)).tolist()
+        ]
+    
+    def test_matches_scalar_extraction(self):
+        """Test batch angles equal extract_joint_angles frame by frame."""
+        rng = np.random.default_rng(0)
+        frames = [self._random_landmarks(rng) for _ in range(50)]
+        
+        batch = extract_joint_angles_batch(np.stack([landmarks_to_array(f) for f in frames]))
+        
+        for i, landmarks in enumerate(frames):
+            expected = extract_joint_angles(landmarks)
+            assert list(batch) == list(expected)
+            for key, value in expected.items():
+                if math.isnan(value):
+                    assert math.isnan(batch[key][i])
+                else:
+                    assert math.isclose(batch[key][i], value, abs_tol=1e-9)
+    
+    def test_kernel_matches_numpy(self):
+        """Test the JIT kernel and the NumPy path build the same table."""
+        rng = np.random.default_rng(2)
+        arr = rng.random((64, 33, 4))
+        arr[rng.random((64, 33)) < 0.2, 3] = 0.1   # Some hidden landmarks
+        arr[5, 25, 0] = np.nan                      # NaN coordinate
+        arr[6, 23, 3] = np.nan                      # NaN visibility
+        arr[7, [23, 25, 27], :2] = 0.5              # Coincident points
+        
+        kernel = _angles_kernel(arr, _TRIPLE_INDEX, _TRUNK_INDEX, 0.5)
+        
+        np.testing.assert_allclose(kernel, _angles_numpy(arr, 0.5), atol=1e-9)
+    
+    def test_coincident_points_return_nan(self):
+        """Test zero-length segments give NaN like calculate_angle."""
+        arr = np.ones((1, 33, 4))
+        arr[0, :, :2] = 0.5
+        
+        angles = extract_joint_angles_batch(arr)
+        
+        assert all(math.isnan(values[0]) for values in angles.values())
+    
+    def test_count_visible_joints(self):
+        """Test only body joints used by the angles are counted."""
+        arr = np.zeros((2, 33, 4))
+        arr[0, :, 3] = 1.0           # Everything visible
+        arr[1, 0:11, 3] = 1.0        # Face only
+        arr[1, 25, 3] = 0.5          # Left knee exactly at threshold
+        
+        counts = count_visible_joints(arr, visibility_threshold=0.5)
+        
+        assert counts.tolist() == [12, 1]
+    
+    def test_hip_height_matches_scalar(self):
+        """Test batch hip height equals get_hip_height_normalized."""
+        rng = np.random.default_rng(1)
+        frames = [self._random_landmarks(rng) for _ in range(20)]
+        
+        heights = get_hip_height_batch(np.stack([landmarks_to_array(f) for f in frames]))
+        
+        for landmarks, height in zip(frames, heights):
+            expected = get_hip_height_normalized(landmarks)
+            assert (math.isnan(expected) and math.isnan(height)) or height == expected
+    
+    def test_landmarks_to_array_batch(self):
+        """Test batch packing equals stacking per-frame arrays."""
+        rng = np.random.default_rng(2)
+        frames = [self._random_landmarks(rng) for _ in range(5)]
+        
+        packed = landmarks_to_array_batch(frames)
+        
+        assert packed.shape == (5, 33, 4)
+        assert packed.dtype == np.float64
+        assert np.array_equal(packed, np.stack([landmarks_to_array(f) for f in frames]))
+        assert landmarks_to_array_batch([]).shape == (0, 33, 4)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
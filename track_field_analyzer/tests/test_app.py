@@ -0,0 +1,43 @@
+"""Unit tests for app helper functions."""
+
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import get_rating, rate_array
+
+
+def _near_edges(optimal, good_range, okay_range):
+    """Values within 0.3 of each band edge, in 0.01 steps."""
+    edges = [optimal - okay_range, optimal - good_range,
+             optimal + good_range, optimal + okay_range]
+    return np.array([e + d / 100 for e in edges for d in range(-30, 31)])
+
+
+class TestRateArray:
+    """Tests for vectorized ratings."""
+    
+    @pytest.mark.parametrize("optimal,good_range,okay_range", [
+        (40, 10, 20), (110, 10, 20), (160, 10, 20), (90, 5, 10),
+    ])
+    @pytest.mark.parametrize("dtype", [np.float64, np.float32])
+    def test_matches_get_rating_at_edges(self, optimal, good_range, okay_range, dtype):
+        """Test parity with get_rating on exact edges and x.x5 values."""
+        values = _near_edges(optimal, good_range, okay_range).astype(dtype)
+        
+        ratings = rate_array(values, optimal, good_range, okay_range)
+        
+        expected = [get_rating(v, optimal, good_range, okay_range)[0] for v in values]
+        assert ratings.tolist() == expected
+    
+    def test_nan_is_poor(self):
+        """Test missing values rate as poor."""
+        assert rate_array(np.array([np.nan]), 110).tolist() == ["poor"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,20 +1,26 @@
 """Unit tests for metrics calculation."""
 
 import math
+import os
 import pytest
 import sys
 from pathlib import Path
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.analysis import metrics as metrics_module
 from src.analysis.metrics import (
     FrameMetrics,
     compute_frame_metrics,
+    compute_frame_metrics_batch,
     aggregate_metrics,
     load_target_ranges,
     generate_feedback,
 )
-from src.analysis.phases import SprintPhase
+from src.analysis.angles import landmarks_to_array
+from src.analysis.phases import PHASE_ORDER, SprintPhase
 from src.pose.mediapipe_pose import Landmark
 
 
@@ -172,6 +178,37 @@ class TestAggregateMetrics:
         assert result["avg_angles"]["left_knee"] == 95.0
 
 
+class TestComputeFrameMetricsBatch:
+    """Tests for batched per-frame metrics."""
+    
+    def test_matches_per_frame_computation(self):
+        """Test batch results equal compute_frame_metrics for each frame."""
+        rng = np.random.default_rng(0)
+        frames = [
+            [Landmark(x=x, y=y, z=z, visibility=v) for x, y, z, v in rng.random((33, 4)).tolist()]
+            for _ in range(30)
+        ]
+        config = load_target_ranges()
+        indices = list(range(0, 60, 2))
+        
+        batch = compute_frame_metrics_batch(
+            indices, 30.0, np.stack([landmarks_to_array(f) for f in frames]), config
+        )
+        
+        assert len(batch) == len(frames)
+        for idx, landmarks, metrics in zip(indices, frames, batch):
+            expected = compute_frame_metrics(idx, 30.0, landmarks, config)
+            assert metrics.frame_index == expected.frame_index
+            assert metrics.timestamp_sec == expected.timestamp_sec
+            assert metrics.phase == expected.phase
+            assert metrics.feedback == expected.feedback
+            assert metrics.to_dict() == expected.to_dict()
+    
+    def test_empty_input(self):
+        """Test no frames gives no metrics."""
+        assert compute_frame_metrics_batch([], 30.0, np.empty((0, 33, 4))) == []
+
+
 class TestLoadTargetRanges:
     """Tests for target range loading."""
     
@@ -190,6 +227,42 @@ class TestLoadTargetRanges:
         result = load_target_ranges("/nonexistent/path/config.yaml")
         assert isinstance(result, dict)
         assert "phases" in result
+    
+    def test_cached_until_file_changes(self, tmp_path):
+        """Test that a file is parsed once and re-read after it is edited."""
+        path = tmp_path / "targets.yaml"
+        path.write_text("phases: {a: 1}\n", encoding="utf-8")
+        
+        metrics_module._parse_target_ranges.cache_clear()
+        load_target_ranges(path)
+        load_target_ranges(str(path))
+        assert metrics_module._parse_target_ranges.cache_info().misses == 1
+        
+        path.write_text("phases: {a: 2}\n", encoding="utf-8")
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+        
+        assert load_target_ranges(path)["phases"] == {"a": 2}
+    
+    def test_default_config_parsed_once(self):
+        """Test that metrics without a config reuse one parsed default."""
+        metrics_module._parse_target_ranges.cache_clear()
+        landmarks = [Landmark(x=0.5, y=0.5, z=0.0, visibility=1.0)] * 33
+        
+        compute_frame_metrics(0, 30.0, landmarks)
+        compute_frame_metrics_batch([0, 1], 30.0, np.stack([landmarks_to_array(landmarks)] * 2))
+        
+        assert metrics_module._parse_target_ranges.cache_info().misses == 1
+    
+    def test_mutating_result_does_not_affect_reload(self, tmp_path):
+        """Test that changes to a returned config do not leak into later calls."""
+        path = tmp_path / "targets.yaml"
+        path.write_text("phases: {drive_phase: {targets: {}}}\n", encoding="utf-8")
+        
+        config = load_target_ranges(path)
+        config["phases"]["drive_phase"]["targets"]["trunk_lean"] = {"min": 0}
+        config["extra"] = True
+        
+        assert load_target_ranges(path) == {"phases": {"drive_phase": {"targets": {}}}}
 
 
 class TestGenerateFeedback:
@@ -214,6 +287,38 @@ class TestGenerateFeedback:
         )
         
         assert feedback == []
+    
+    def test_front_knee_ignores_missing_side(self):
+        """Test that one missing knee falls back to the visible one."""
+        config = {"phases": {"set_position": {"targets": {
+            "front_knee_angle": {"min": 80, "max": 100, "feedback_low": "low"},
+        }}}}
+        
+        feedback = generate_feedback(
+            angles={"left_knee": float("nan"), "right_knee": 70.0},
+            phase=SprintPhase.SET,
+            target_config=config,
+        )
+        
+        assert feedback == ["low"]
+    
+    def test_batch_matches_per_frame(self):
+        """Test that batch feedback equals generate_feedback frame by frame."""
+        rng = np.random.default_rng(1)
+        names = ["trunk_lean", "left_knee", "right_knee", "left_elbow", "right_elbow"]
+        columns = {
+            name: np.where(rng.random(200) < 0.2, np.nan, rng.uniform(-90, 180, 200))
+            for name in names
+        }
+        codes = rng.integers(0, len(PHASE_ORDER), 200)
+        config = load_target_ranges()
+        
+        batch = metrics_module._generate_feedback_batch(columns, codes, config)
+        
+        assert any(batch)
+        for i, feedback in enumerate(batch):
+            angles = {name: float(columns[name][i]) for name in names}
+            assert feedback == generate_feedback(angles, PHASE_ORDER[codes[i]], config)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,83 @@
+"""Unit tests for frame annotation."""
+
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analysis.phases import SprintPhase
+from src.pose.mediapipe_pose import Landmark
+from src.viz.overlay import annotate_frame, draw_phase_label, draw_skeleton
+
+
+def _landmarks(visibility=0.9):
+    """33 landmarks spread across the frame."""
+    return [
+        Landmark(x=0.2 + 0.018 * i, y=0.2 + 0.018 * i, z=0.0, visibility=visibility)
+        for i in range(33)
+    ]
+
+
+ANGLES = {"left_knee": 120.0, "right_knee": 95.0, "trunk_lean": 42.0}
+
+
+class TestAnnotateFrame:
+    """Tests for the full annotation pipeline."""
+
+    def test_leaves_input_unchanged(self):
+        """Test that without out the input frame is not drawn on."""
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+
+        annotated = annotate_frame(frame, _landmarks(), ANGLES, SprintPhase.DRIVE)
+
+        assert not frame.any()
+        assert annotated.any()
+
+    def test_out_buffer_matches_copy(self):
+        """Test that drawing into out gives the same image as a fresh copy."""
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        out = np.full_like(frame, 77)
+
+        expected = annotate_frame(frame, _landmarks(), ANGLES, SprintPhase.DRIVE)
+        result = annotate_frame(frame, _landmarks(), ANGLES, SprintPhase.DRIVE, out=out)
+
+        assert result is out
+        assert np.array_equal(out, expected)
+        assert not frame.any()
+
+    def test_in_place(self):
+        """Test that passing the frame as out annotates it in place."""
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        expected = annotate_frame(frame, _landmarks(), ANGLES, SprintPhase.DRIVE)
+
+        result = annotate_frame(frame, _landmarks(), ANGLES, SprintPhase.DRIVE, out=frame)
+
+        assert result is frame
+        assert np.array_equal(frame, expected)
+
+    def test_matches_layered_drawing(self):
+        """Test that the fused pipeline equals the public layer functions."""
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+
+        layered = draw_phase_label(draw_skeleton(frame, _landmarks()), SprintPhase.SET)
+        fused = annotate_frame(
+            frame, _landmarks(), ANGLES, SprintPhase.SET,
+            draw_angles=False, draw_info=False,
+        )
+
+        assert np.array_equal(fused, layered)
+
+    def test_hidden_landmarks_not_drawn(self):
+        """Test that no skeleton is drawn for invisible landmarks."""
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+
+        skeleton = draw_skeleton(frame, _landmarks(visibility=0.1))
+
+        assert not skeleton.any()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -5,10 +5,14 @@ import pytest
 import sys
 from pathlib import Path
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.analysis.phases import (
     detect_sprint_phase,
+    detect_sprint_phases_batch,
+    PHASE_ORDER,
     SprintPhase,
     get_phase_description,
 )
@@ -119,6 +123,32 @@ class TestDetectSprintPhase:
         assert SprintPhase.MAX_VELOCITY in phases[-3:]
 
 
+class TestDetectSprintPhasesBatch:
+    """Tests for vectorized phase detection."""
+    
+    def test_matches_scalar_detection(self):
+        """Test batch codes equal detect_sprint_phase over a value grid."""
+        leans = [-60.0, -30.0, 0.0, 12.0, 20.0, 30.0, 45.0, 55.0, float("nan")]
+        hips = [0.3, 0.4, 0.5, 0.6, 0.7, float("nan")]
+        knees = [None, 70.0, 100.0, 130.0]
+        grid = [(l, h, k) for l in leans for h in hips for k in knees]
+        
+        codes = detect_sprint_phases_batch(
+            np.array([l for l, _, _ in grid]),
+            np.array([h for _, h, _ in grid]),
+            np.array([np.nan if k is None else k for _, _, k in grid]),
+        )
+        
+        for (lean, hip, knee), code in zip(grid, codes):
+            assert PHASE_ORDER[code] == detect_sprint_phase(lean, hip, knee)
+    
+    def test_without_knee_angles(self):
+        """Test omitted knee angles behave like knee_angle_front=None."""
+        codes = detect_sprint_phases_batch(np.array([50.0]), np.array([0.65]))
+        
+        assert PHASE_ORDER[codes[0]] == SprintPhase.SET
+
+
 class TestSprintPhaseEnum:
     """Tests for SprintPhase enum properties."""
     
@@ -0,0 +1,265 @@
+"""Unit tests for pose estimation helpers."""
+
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pose import mediapipe_pose
+from src.pose.mediapipe_pose import (
+    PoseEstimator,
+    PoseEstimatorLegacy,
+    PoseEstimatorTasks,
+    estimate_poses_parallel,
+)
+
+
+class RecordingEstimator:
+    """Stand-in estimator returning each frame's marker value."""
+    
+    def __init__(self, static_image_mode=False):
+        self.static_image_mode = static_image_mode
+        self.seen = []
+        self.threads = set()
+    
+    def process_frame(self, frame_rgb):
+        self.seen.append(int(frame_rgb[0, 0, 0]))
+        self.threads.add(threading.get_ident())
+        return int(frame_rgb[0, 0, 0])
+
+
+def _frames(n):
+    return [np.full((2, 2, 3), i, dtype=np.uint8) for i in range(n)]
+
+
+class TestEstimatePosesParallel:
+    """Tests for frame-parallel pose inference."""
+    
+    def test_results_in_input_order(self):
+        """Test results line up with input frames."""
+        estimators = [RecordingEstimator() for _ in range(3)]
+        
+        results = estimate_poses_parallel(_frames(10), estimators)
+        
+        assert results == list(range(10))
+    
+    def test_tracking_sees_whole_clip_across_windows(self):
+        """Test one tracking estimator gets every frame, in order, over all windows."""
+        estimators = [RecordingEstimator() for _ in range(4)]
+        frames = _frames(40)
+        
+        results = []
+        for start in range(0, 40, 16):
+            results += estimate_poses_parallel(frames[start:start + 16], estimators)
+        
+        assert results == list(range(40))
+        assert [e.seen for e in estimators] == [list(range(40)), [], [], []]
+    
+    def test_fewer_frames_than_estimators(self):
+        """Test spare static estimators are left idle."""
+        estimators = [RecordingEstimator(static_image_mode=True) for _ in range(4)]
+        
+        results = estimate_poses_parallel(_frames(2), estimators)
+        
+        assert results == [0, 1]
+        assert sorted(i for e in estimators for i in e.seen) == [0, 1]
+        assert all(not e.seen for e in estimators[2:])
+    
+    def test_empty_input(self):
+        """Test no frames yields no results."""
+        assert estimate_poses_parallel([], [RecordingEstimator()]) == []
+    
+    def test_static_estimators_share_frames(self):
+        """Test static-mode workers each process every frame once, in any split."""
+        estimators = [RecordingEstimator(static_image_mode=True) for _ in range(3)]
+        
+        results = estimate_poses_parallel(_frames(20), estimators)
+        
+        assert results == list(range(20))
+        assert sorted(i for e in estimators for i in e.seen) == list(range(20))
+
+
+class ShapeRecordingImpl:
+    """Stand-in backend recording the shape and buffer of each input."""
+    
+    def __init__(self, static_image_mode, **kwargs):
+        self.static_image_mode = static_image_mode
+        self.inputs = []
+        self.resets = 0
+    
+    def process_frame(self, frame_rgb):
+        self.inputs.append((frame_rgb.shape, frame_rgb.__array_interface__["data"][0]))
+        return None
+    
+    def reset(self):
+        self.resets += 1
+    
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def make_estimator(monkeypatch):
+    """Build PoseEstimators on ShapeRecordingImpl backends."""
+    monkeypatch.setattr(mediapipe_pose, "_import_mediapipe", lambda: False)
+    monkeypatch.setattr(mediapipe_pose, "PoseEstimatorTasks", ShapeRecordingImpl)
+    return PoseEstimator
+
+
+class TestPoseEstimatorInput:
+    """Tests for input downscaling in PoseEstimator."""
+    
+    @pytest.fixture
+    def estimator(self, make_estimator):
+        return make_estimator(static_image_mode=True, max_input_size=64)
+    
+    def test_downscales_to_max_input_size(self, estimator):
+        """Test the longer side is shrunk to max_input_size."""
+        estimator.process_frame(np.zeros((120, 160, 3), dtype=np.uint8))
+        
+        assert estimator._impl.inputs[0][0] == (48, 64, 3)
+    
+    def test_reuses_input_buffer(self, estimator):
+        """Test same-size frames are downscaled into one buffer."""
+        for _ in range(3):
+            estimator.process_frame(np.zeros((120, 160, 3), dtype=np.uint8))
+        
+        assert len({ptr for _, ptr in estimator._impl.inputs}) == 1
+    
+    def test_small_frames_passed_through(self, estimator):
+        """Test frames within max_input_size are not resized."""
+        frame = np.zeros((48, 32, 3), dtype=np.uint8)
+        
+        estimator.process_frame(frame)
+        
+        assert estimator._impl.inputs[0] == (frame.shape, frame.__array_interface__["data"][0])
+
+
+class TestPoseEstimatorReset:
+    """Tests for clearing tracking state between clips."""
+    
+    @pytest.fixture
+    def estimator(self, make_estimator):
+        return make_estimator(static_image_mode=False)
+    
+    def test_reset_keeps_models(self, estimator):
+        """Test that a new clip reuses the loaded backends and resets both."""
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        for _ in range(PoseEstimator.TRACKING_MISS_LIMIT + 1):
+            estimator.process_frame(frame)
+        impl, static_impl = estimator._impl, estimator._static_impl
+        
+        estimator.reset()
+        
+        assert estimator._impl is impl
+        assert estimator._static_impl is static_impl
+        assert (impl.resets, static_impl.resets) == (1, 1)
+    
+    def test_reset_clears_miss_streak(self, estimator):
+        """Test that re-detection fallback does not carry into a new clip."""
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        for _ in range(PoseEstimator.TRACKING_MISS_LIMIT + 1):
+            estimator.process_frame(frame)
+        tracked = len(estimator._impl.inputs)
+        fallback = len(estimator._static_impl.inputs)
+        
+        estimator.reset()
+        estimator.process_frame(frame)
+        
+        assert len(estimator._impl.inputs) == tracked + 1
+        assert len(estimator._static_impl.inputs) == fallback
+
+
+class FakeLegacyPose:
+    """Stand-in for mp_pose.Pose recording every graph built."""
+    
+    built = []
+    
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.closed = False
+        FakeLegacyPose.built.append(self)
+    
+    def process(self, frame):
+        return type("Results", (), {"pose_landmarks": None})()
+    
+    def close(self):
+        self.closed = True
+
+
+class TestBackendReset:
+    """Tests for per-clip reset in the MediaPipe backends."""
+    
+    @pytest.fixture
+    def fake_pose(self, monkeypatch):
+        FakeLegacyPose.built = []
+        monkeypatch.setattr(
+            mediapipe_pose, "mp_pose",
+            type("FakeModule", (), {"Pose": FakeLegacyPose}),
+            raising=False,
+        )
+        return FakeLegacyPose
+    
+    def test_legacy_untracked_graph_kept(self, fake_pose):
+        """Test a legacy graph that has not tracked anything is not rebuilt."""
+        estimator = PoseEstimatorLegacy(static_image_mode=False)
+        
+        estimator.reset()
+        
+        assert len(fake_pose.built) == 1
+    
+    def test_legacy_tracked_graph_rebuilt(self, fake_pose):
+        """Test a legacy graph is rebuilt once after a tracked clip."""
+        estimator = PoseEstimatorLegacy(static_image_mode=False, model_complexity=2)
+        estimator.process_frame(np.zeros((4, 4, 3), dtype=np.uint8))
+        
+        estimator.reset()
+        estimator.reset()
+        
+        assert len(fake_pose.built) == 2
+        assert fake_pose.built[0].closed
+        assert fake_pose.built[1].kwargs == fake_pose.built[0].kwargs
+    
+    def test_legacy_static_graph_kept(self, fake_pose):
+        """Test a static-mode legacy graph is never rebuilt."""
+        estimator = PoseEstimatorLegacy(static_image_mode=True)
+        estimator.process_frame(np.zeros((4, 4, 3), dtype=np.uint8))
+        
+        estimator.reset()
+        
+        assert len(fake_pose.built) == 1
+    
+    def _tasks(self, static_image_mode):
+        # Skip __init__, which needs the landmarker model file
+        estimator = PoseEstimatorTasks.__new__(PoseEstimatorTasks)
+        estimator._detector = object()
+        estimator._static_mode = static_image_mode
+        estimator._frame_timestamp = 330
+        estimator._is_closed = False
+        return estimator
+    
+    def test_tasks_reset_advances_clock(self):
+        """Test video mode keeps its landmarker and moves the clock forward."""
+        estimator = self._tasks(static_image_mode=False)
+        detector = estimator._detector
+        
+        estimator.reset()
+        
+        assert estimator._detector is detector
+        assert estimator._frame_timestamp == 330 + PoseEstimatorTasks.CLIP_GAP_MS
+    
+    def test_tasks_static_reset_is_noop(self):
+        """Test image mode has no clock to reset."""
+        estimator = self._tasks(static_image_mode=True)
+        
+        estimator.reset()
+        
+        assert estimator._frame_timestamp == 330
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
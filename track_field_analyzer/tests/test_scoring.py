@@ -0,0 +1,119 @@
+"""Unit tests for batch form scoring."""
+
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analysis.phases import PHASE_INDEX, SprintPhase
+from src.analysis.scoring import calculate_form_scores_batch, rate_form_scores
+
+
+def _score(trunk, lknee, rknee, phase):
+    """Score a single frame through the batch API."""
+    scores, inner_hit = calculate_form_scores_batch(
+        np.array([trunk]), np.array([lknee]), np.array([rknee]),
+        np.array([PHASE_INDEX[phase]]),
+    )
+    return float(scores[0]), bool(inner_hit[0])
+
+
+class TestCalculateFormScoresBatch:
+    """Tests for vectorized form scoring."""
+    
+    def test_inner_band_and_knee_bonus(self):
+        """Test inner trunk band plus knee drive bonus."""
+        score, inner = _score(45.0, 100.0, 150.0, SprintPhase.SET)
+        
+        assert score == pytest.approx(8.0)
+        assert inner
+    
+    def test_outer_band(self):
+        """Test outer trunk band awards partial points."""
+        score, inner = _score(52.0, 150.0, 150.0, SprintPhase.DRIVE)
+        
+        assert score == pytest.approx(6.5)
+        assert not inner
+    
+    def test_negative_lean_uses_magnitude(self):
+        """Test trunk lean is scored by absolute value."""
+        score, _ = _score(-10.0, 150.0, 150.0, SprintPhase.MAX_VELOCITY)
+        
+        assert score == pytest.approx(7.5)
+    
+    def test_unknown_phase_penalty(self):
+        """Test unknown phase gets no trunk points and a penalty."""
+        score, inner = _score(45.0, 150.0, 150.0, SprintPhase.UNKNOWN)
+        
+        assert score == pytest.approx(4.0)
+        assert not inner
+    
+    def test_nan_angles_score_baseline(self):
+        """Test missing angles earn no bonuses."""
+        score, inner = _score(np.nan, np.nan, np.nan, SprintPhase.ACCELERATION)
+        
+        assert score == pytest.approx(5.0)
+        assert not inner
+    
+    def test_zero_knee_is_a_real_angle(self):
+        """Test a 0.0 knee is scored as the front knee, not skipped as missing."""
+        left_zero, _ = _score(np.nan, 0.0, 100.0, SprintPhase.ACCELERATION)
+        right_zero, _ = _score(np.nan, 100.0, 0.0, SprintPhase.ACCELERATION)
+        zero_and_missing, _ = _score(np.nan, 0.0, np.nan, SprintPhase.ACCELERATION)
+        
+        assert left_zero == pytest.approx(5.0)
+        assert right_zero == pytest.approx(5.0)
+        assert zero_and_missing == pytest.approx(5.0)
+    
+    def test_knee_bonus_matches_fmin(self):
+        """Test the bonus follows np.fmin of the knees, including 0.0 and NaN."""
+        values = [0.0, 89.0, 90.0, 100.0, 120.0, 121.0, np.nan]
+        left, right = (a.ravel() for a in np.meshgrid(values, values))
+        n = len(left)
+        
+        scores, _ = calculate_form_scores_batch(
+            np.full(n, np.nan), left, right,
+            np.full(n, PHASE_INDEX[SprintPhase.ACCELERATION]),
+        )
+        
+        front = np.fmin(left, right)
+        expected = 5.0 + ((front >= 90) & (front <= 120))
+        assert np.allclose(scores, expected)
+    
+    def test_missing_knee_uses_other_side(self):
+        """Test the knee bonus uses whichever knee is visible."""
+        left_missing, _ = _score(np.nan, np.nan, 100.0, SprintPhase.ACCELERATION)
+        right_missing, _ = _score(np.nan, 100.0, np.nan, SprintPhase.ACCELERATION)
+        
+        assert left_missing == pytest.approx(6.0)
+        assert right_missing == pytest.approx(6.0)
+    
+    def test_many_frames(self):
+        """Test output lengths match input."""
+        n = 50
+        scores, inner_hit = calculate_form_scores_batch(
+            np.full(n, 20.0), np.full(n, 100.0), np.full(n, 100.0),
+            np.full(n, PHASE_INDEX[SprintPhase.ACCELERATION]),
+        )
+        
+        assert scores.shape == (n,)
+        assert inner_hit.all()
+        assert np.allclose(scores, 8.0)
+
+
+
+class TestRateFormScores:
+    """Tests for vectorized hero ratings."""
+    
+    def test_breakpoints(self):
+        """Test that 5 and 7 start the okay and good ratings."""
+        ratings = rate_form_scores(np.array([0.0, 4.9, 5.0, 6.9, 7.0, 10.0]))
+        
+        assert ratings.tolist() == ["poor", "poor", "okay", "okay", "good", "good"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,317 @@
+"""Unit tests for video loading and frame utilities."""
+
+import io
+import pytest
+import sys
+import tempfile
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.io import video
+from src.io.video import (
+    cleanup_temp_file,
+    decode_frame_jpeg,
+    encode_frame_jpeg,
+    get_video_properties,
+    load_video_from_uploaded_file,
+    prefetch,
+    sample_frames,
+)
+
+
+def _write_test_video(path, n_frames=12, size=(64, 48)):
+    """Write a small MJPG video whose frame i has red value 20 * i."""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 30, size)
+    for i in range(n_frames):
+        frame = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+        frame[..., 2] = 20 * i  # Red in BGR
+        writer.write(frame)
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture(params=["opencv", "pyav"])
+def decode_backend(request, monkeypatch):
+    """Run a test against each sample_frames backend."""
+    if request.param == "pyav" and not video.PYAV_AVAILABLE:
+        pytest.skip("PyAV not installed")
+    monkeypatch.setattr(video, "PYAV_AVAILABLE", request.param == "pyav")
+    return request.param
+
+
+@pytest.mark.usefixtures("decode_backend")
+class TestSampleFrames:
+    """Tests for frame sampling."""
+
+    def test_sampling(self, tmp_path):
+        """Test that every Nth frame is yielded with its index."""
+        video = _write_test_video(tmp_path / "clip.avi")
+
+        frames = list(sample_frames(video, sample_rate=3))
+
+        assert [idx for idx, _ in frames] == [0, 3, 6, 9]
+        for idx, frame_rgb in frames:
+            assert frame_rgb.shape == (48, 64, 3)
+            assert abs(int(frame_rgb[24, 32, 0]) - 20 * idx) <= 8
+
+    def test_max_frames(self, tmp_path):
+        """Test that sampling stops at max_frames."""
+        video = _write_test_video(tmp_path / "clip.avi")
+
+        frames = list(sample_frames(video, sample_rate=2, max_frames=3))
+
+        assert [idx for idx, _ in frames] == [0, 2, 4]
+
+    def test_max_width_downscales(self, tmp_path):
+        """Test that frames wider than max_width are shrunk with colour intact."""
+        video = _write_test_video(tmp_path / "clip.avi")
+
+        frames = list(sample_frames(video, sample_rate=3, max_width=32))
+
+        assert [idx for idx, _ in frames] == [0, 3, 6, 9]
+        for idx, frame_rgb in frames:
+            assert frame_rgb.shape == (24, 32, 3)
+            assert abs(int(frame_rgb[12, 16, 0]) - 20 * idx) <= 8
+
+    def test_invalid_path_raises(self, tmp_path):
+        """Test that an unreadable video raises ValueError."""
+        with pytest.raises(ValueError):
+            list(sample_frames(str(tmp_path / "missing.mp4")))
+
+
+@pytest.mark.skipif(not video.PYAV_AVAILABLE, reason="PyAV not installed")
+class TestInMemoryVideo:
+    """Tests for decoding videos passed as bytes."""
+
+    def test_sampling_from_bytes(self, tmp_path):
+        """Test that bytes input yields the same frames as the file path."""
+        path = _write_test_video(tmp_path / "clip.avi")
+        data = Path(path).read_bytes()
+
+        from_bytes = list(sample_frames(data, sample_rate=3))
+        from_path = list(sample_frames(path, sample_rate=3))
+
+        assert [idx for idx, _ in from_bytes] == [0, 3, 6, 9]
+        for (_, a), (_, b) in zip(from_bytes, from_path):
+            assert np.array_equal(a, b)
+
+    def test_properties_match_path(self, tmp_path):
+        """Test that bytes and path report the same metadata."""
+        path = _write_test_video(tmp_path / "clip.avi")
+
+        from_bytes = get_video_properties(Path(path).read_bytes())
+
+        assert from_bytes == get_video_properties(path)
+
+    def test_frames_without_rotation_attribute(self, tmp_path, monkeypatch):
+        """Test PyAV builds whose frames lack .rotation still decode."""
+        path = _write_test_video(tmp_path / "clip.avi")
+        open_pyav = video._open_pyav
+
+        class NoRotation:
+            def __init__(self, frame):
+                self._frame = frame
+
+            def __getattr__(self, name):
+                if name == "rotation":
+                    raise AttributeError(name)
+                return getattr(self._frame, name)
+
+        class Container:
+            def __init__(self, source):
+                self._container = open_pyav(source)
+                self.streams = self._container.streams
+
+            def decode(self, stream):
+                return (NoRotation(f) for f in self._container.decode(stream))
+
+            def close(self):
+                self._container.close()
+
+        monkeypatch.setattr(video, "_open_pyav", Container)
+        monkeypatch.setattr(video, "PYAV_AVAILABLE", True)
+
+        frames = list(sample_frames(path, sample_rate=3))
+
+        assert [idx for idx, _ in frames] == [0, 3, 6, 9]
+
+    def test_invalid_bytes_raise(self):
+        """Test that undecodable bytes raise ValueError."""
+        with pytest.raises(ValueError):
+            get_video_properties(b"not a video")
+        with pytest.raises(ValueError):
+            list(sample_frames(b"not a video"))
+
+    def test_bytes_without_pyav_raise(self, monkeypatch):
+        """Test that bytes input needs PyAV."""
+        monkeypatch.setattr(video, "PYAV_AVAILABLE", False)
+
+        with pytest.raises(ValueError):
+            list(sample_frames(b"\x00"))
+
+
+class _Upload(io.BytesIO):
+    """Minimal stand-in for Streamlit's UploadedFile."""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+
+class TestLoadVideoFromUploadedFile:
+    """Tests for writing uploads to a temp file."""
+
+    def test_writes_readable_copy(self, tmp_path, monkeypatch):
+        """Test that the temp file holds the upload and goes to the RAM dir."""
+        data = Path(_write_test_video(tmp_path / "clip.avi")).read_bytes()
+        shm = tmp_path / "shm"
+        shm.mkdir()
+        monkeypatch.setattr(video, "_SHM_DIR", str(shm))
+
+        path = load_video_from_uploaded_file(_Upload(data, "Clip.AVI"))
+        try:
+            assert Path(path).parent == shm
+            assert path.endswith(".avi")
+            assert Path(path).read_bytes() == data
+        finally:
+            cleanup_temp_file(path)
+
+    def test_falls_back_without_ram_dir(self, tmp_path, monkeypatch):
+        """Test that a missing RAM dir uses the default temp dir."""
+        data = Path(_write_test_video(tmp_path / "clip.avi")).read_bytes()
+        monkeypatch.setattr(video, "_SHM_DIR", str(tmp_path / "missing"))
+
+        path = load_video_from_uploaded_file(_Upload(data, "clip.avi"))
+        try:
+            assert Path(path).parent == Path(tempfile.gettempdir())
+        finally:
+            cleanup_temp_file(path)
+
+    def test_unreadable_upload_removed(self, tmp_path, monkeypatch):
+        """Test that a temp file OpenCV cannot open is not left behind."""
+        shm = tmp_path / "shm"
+        shm.mkdir()
+        monkeypatch.setattr(video, "_SHM_DIR", str(shm))
+
+        with pytest.raises(ValueError):
+            load_video_from_uploaded_file(_Upload(b"not a video", "clip.avi"))
+
+        assert not any(shm.iterdir())
+
+
+class TestPrefetch:
+    """Tests for background prefetching."""
+
+    def test_preserves_order(self):
+        """Test that items come out in source order."""
+        assert list(prefetch(range(50), maxsize=3)) == list(range(50))
+
+    def test_reraises_producer_error(self):
+        """Test that a failure in the source reaches the consumer."""
+        def failing():
+            yield 1
+            raise RuntimeError("decode failed")
+
+        gen = prefetch(failing())
+
+        assert next(gen) == 1
+        with pytest.raises(RuntimeError, match="decode failed"):
+            next(gen)
+
+    def test_close_stops_source(self):
+        """Test that closing early closes the source generator."""
+        closed = []
+
+        def source():
+            try:
+                for i in range(1000):
+                    yield i
+            finally:
+                closed.append(True)
+
+        gen = prefetch(source(), maxsize=2)
+        assert next(gen) == 0
+        gen.close()
+
+        assert closed == [True]
+
+
+class TestEncodeFrameJpeg:
+    """Tests for JPEG frame encoding."""
+
+    def test_returns_jpeg_bytes(self):
+        """Test that output is JPEG data."""
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+
+        data = encode_frame_jpeg(frame)
+
+        assert isinstance(data, bytes)
+        assert data[:2] == b"\xff\xd8"  # JPEG SOI marker
+
+    def test_round_trip_preserves_shape_and_color(self):
+        """Test that decoding returns the same size and RGB channel order."""
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        frame[..., 0] = 200  # Red in RGB
+
+        data = encode_frame_jpeg(frame, quality=95)
+        decoded_bgr = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        decoded_rgb = cv2.cvtColor(decoded_bgr, cv2.COLOR_BGR2RGB)
+
+        assert decoded_rgb.shape == frame.shape
+        assert abs(int(decoded_rgb[24, 32, 0]) - 200) <= 5
+        assert decoded_rgb[24, 32, 2] <= 5
+
+    def test_smaller_than_raw(self):
+        """Test that encoding compresses a smooth frame."""
+        frame = np.tile(np.arange(256, dtype=np.uint8), (240, 2))
+        frame = np.dstack([frame, frame, frame])
+
+        data = encode_frame_jpeg(frame)
+
+        assert len(data) < frame.nbytes / 5
+
+    def test_max_width_downscales_preserving_aspect(self):
+        """Test that wide frames are shrunk to max_width."""
+        frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+
+        data = encode_frame_jpeg(frame, max_width=480)
+        decoded = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+
+        assert decoded.shape[:2] == (270, 480)
+
+    def test_max_width_leaves_narrow_frames(self):
+        """Test that frames already within max_width keep their size."""
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+
+        data = encode_frame_jpeg(frame, max_width=480)
+        decoded = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+
+        assert decoded.shape[:2] == (48, 64)
+
+
+class TestDecodeFrameJpeg:
+    """Tests for JPEG frame decoding."""
+
+    def test_round_trip(self):
+        """Test that decoding an encoded frame restores RGB order and size."""
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        frame[..., 0] = 200  # Red in RGB
+
+        decoded = decode_frame_jpeg(encode_frame_jpeg(frame, quality=95))
+
+        assert decoded.shape == frame.shape
+        assert abs(int(decoded[24, 32, 0]) - 200) <= 5
+        assert decoded[24, 32, 2] <= 5
+
+    def test_invalid_data_raises(self):
+        """Test that non-JPEG data raises ValueError."""
+        with pytest.raises(ValueError):
+            decode_frame_jpeg(b"not a jpeg")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])